@@ -22,13 +22,13 @@ from app.api.schemas import (
 )
 from app.models.interface import DataInterface
 from app.models.task import TaskExecution, TaskStatus
-from app.services.data_acquisition import DataAcquisitionService
+from app.services.data_acquisition import get_data_acquisition_service
 from app.utils.constants import ESTIMATED_DOWNLOAD_SECONDS
 
 router = APIRouter()
 
-# Service instance
-data_service = DataAcquisitionService()
+# Shared service instance
+data_service = get_data_acquisition_service()
 
 
 def _log_task_exception(task: asyncio.Task) -> None:
@@ -25,6 +25,7 @@ from app.api.schemas import (
 )
 from app.core.database import get_data_db
 from app.models.data_table import DataTable
+from app.services.data_acquisition import get_data_acquisition_service
 from app.utils.constants import CSV_EXPORT_BATCH_SIZE, XLSX_EXPORT_ROW_LIMIT
 from app.utils.db_result import get_columns_from_result
 from app.utils.helpers import safe_table_name
@@ -340,6 +341,8 @@ async def delete_table(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to drop table: {e!s}",
         ) from e
+    # The next download must re-run CREATE TABLE rather than trust the DDL cache
+    get_data_acquisition_service().forget_table(table.table_name)
 
     # Delete metadata
     await db.delete(table)
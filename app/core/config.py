@@ -157,6 +157,13 @@ class Settings(BaseSettings):
     akshare_timeout: int = Field(default=120, description="akshare request timeout")
     akshare_call_timeout: int = Field(default=120, description="akshare call timeout")
     akshare_retry_attempts: int = Field(default=3, description="akshare retry attempts")
+    akshare_max_concurrency: int = Field(
+        default=8, ge=1, description="Max concurrent blocking akshare calls"
+    )
+    akshare_bulk_load: bool = Field(
+        default=False,
+        description="Store data via LOAD DATA LOCAL INFILE (server needs local_infile=ON)",
+    )
 
     @field_validator("secret_key", mode="after")
     @classmethod
@@ -193,6 +200,11 @@ class Settings(BaseSettings):
         """Check if running in production mode."""
         return self.app_env == "production"
 
+    @property
+    def is_testing(self) -> bool:
+        """Check if running in testing mode."""
+        return self.app_env == "testing"
+
     @property
     def database_url(self) -> str:
         """Get async database URL for SQLAlchemy."""
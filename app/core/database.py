@@ -6,6 +6,7 @@ Provides async database session management using SQLAlchemy.
 
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
+from typing import Any
 
 from loguru import logger
 from sqlalchemy import MetaData, select
@@ -15,6 +16,7 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import NullPool
 
 from app.core.config import settings
 
@@ -35,14 +37,29 @@ class Base(DeclarativeBase):
     }
 
 
+def _engine_options() -> dict[str, Any]:
+    """
+    Engine keyword arguments for the current environment.
+
+    In the testing environment no pool is kept and connections are not
+    pre-pinged, so importing this module never opens or holds a connection.
+    """
+    if settings.is_testing:
+        return {"poolclass": NullPool, "echo": settings.app_debug, "pool_pre_ping": False}
+    options: dict[str, Any] = {
+        "pool_size": settings.database_pool_size,
+        "max_overflow": settings.database_max_overflow,
+        "echo": settings.app_debug,
+        "pool_pre_ping": True,
+    }
+    if settings.akshare_bulk_load:
+        # Client side of LOAD DATA LOCAL INFILE (see DataAcquisitionService._insert_data)
+        options["connect_args"] = {"local_infile": True}
+    return options
+
+
 # Create async engine
-engine = create_async_engine(
-    settings.database_url,
-    pool_size=settings.database_pool_size,
-    max_overflow=settings.database_max_overflow,
-    echo=settings.app_debug,
-    pool_pre_ping=True,
-)
+engine = create_async_engine(settings.database_url, **_engine_options())
 
 # Create async session factory
 async_session_maker = async_sessionmaker(
@@ -54,13 +71,7 @@ async_session_maker = async_sessionmaker(
 )
 
 # Data warehouse async engine (for akshare data tables)
-data_engine = create_async_engine(
-    settings.data_database_url_async,
-    pool_size=settings.database_pool_size,
-    max_overflow=settings.database_max_overflow,
-    echo=settings.app_debug,
-    pool_pre_ping=True,
-)
+data_engine = create_async_engine(settings.data_database_url_async, **_engine_options())
 
 # Data warehouse async session factory
 data_session_maker = async_sessionmaker(
@@ -1,7 +1,10 @@
 """Service modules."""
 
 from app.data_fetch.providers.akshare_provider import AkshareProvider
-from app.services.data_acquisition import DataAcquisitionService
+from app.services.data_acquisition import (
+    DataAcquisitionService,
+    get_data_acquisition_service,
+)
 from app.services.data_service import DataService
 from app.services.execution_service import ExecutionService
 from app.services.scheduler import task_scheduler
@@ -14,6 +17,7 @@ __all__ = [
     "DataService",
     "ExecutionService",
     "ScriptService",
+    "get_data_acquisition_service",
     "get_scheduler_service",
     "init_scheduler_service",
     "task_scheduler",
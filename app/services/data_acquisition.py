@@ -7,23 +7,28 @@ Handles execution of akshare data interface calls and database storage.
 import asyncio
 import functools
 import hashlib
+import tempfile
+from collections.abc import Callable
 from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime
-from typing import Any
+from pathlib import Path
+from typing import Any, cast
 
 import pandas as pd
 from loguru import logger
-from sqlalchemy import text
+from sqlalchemy import TextClause, text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 import akshare as ak
+from app.core.config import settings
 from app.models.data_table import DataTable
 from app.models.interface import DataInterface
 from app.models.task import TaskExecution, TaskStatus
 from app.utils.constants import (
-    BATCH_SIZE_LARGE,
-    BATCH_SIZE_SMALL,
-    BATCH_SIZE_THRESHOLD,
+    INSERT_BATCH_ROWS,
+    INSERT_MAX_PARAMS,
+    STORE_CHUNK_ROWS,
 )
 from app.utils.db_result import get_rowcount
 from app.utils.helpers import (
@@ -33,6 +38,45 @@ from app.utils.helpers import (
     safe_table_name,
 )
 
+# Escapes for MySQL's default LOAD DATA field format (tab-separated, backslash-escaped)
+_LOAD_DATA_ESCAPES = str.maketrans(
+    {"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r", "\0": "\\0"}
+)
+
+
+def _load_data_field(value: Any) -> str:  # noqa: ANN401
+    """Format one value for LOAD DATA's default field format (NULL is ``\\N``)."""
+    if value is None or (pd.api.types.is_scalar(value) and pd.isna(value)):
+        return "\\N"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    return str(value).translate(_LOAD_DATA_ESCAPES)
+
+
+# SQL column type by numpy/pandas dtype kind (covers nullable and tz-aware variants)
+_SQL_TYPE_BY_KIND = {"i": "BIGINT", "u": "BIGINT", "f": "DOUBLE", "M": "DATETIME"}
+
+
+def _sql_column_type(series: pd.Series) -> str:
+    """SQL type for a column; non-numeric, non-datetime data becomes a sized VARCHAR."""
+    sql_type = _SQL_TYPE_BY_KIND.get(series.dtype.kind)
+    if sql_type is not None:
+        return sql_type
+    # String type with 2x safety margin, min 255, max 2000
+    max_len = series.astype(str).str.len().max()
+    return f"VARCHAR({min(max(int((max_len or 1) * 2), 255), 2000)})"
+
+
+@functools.lru_cache(maxsize=1024)
+def resolve_akshare_function(name: str) -> Callable[..., Any]:
+    """
+    Resolve an akshare function by name.
+
+    Hits are cached; misses raise AttributeError and are not cached. Call
+    ``resolve_akshare_function.cache_clear()`` after patching ``ak``.
+    """
+    return cast("Callable[..., Any]", getattr(ak, name))
+
 
 class DataAcquisitionService:
     """
@@ -42,10 +86,16 @@ class DataAcquisitionService:
     """
 
     # Dedicated thread pool for blocking akshare calls (avoids starving default pool)
-    _akshare_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="akshare")
+    _akshare_executor = ThreadPoolExecutor(
+        max_workers=settings.akshare_max_concurrency, thread_name_prefix="akshare"
+    )
 
     def __init__(self) -> None:
         self._active_executions: dict[int, dict] = {}
+        # (table_name, column names) pairs whose CREATE TABLE already ran in this process
+        self._known_tables: set[tuple[str, tuple[str, ...]]] = set()
+        # Bounds in-flight akshare calls to the executor size
+        self._akshare_semaphore = asyncio.Semaphore(settings.akshare_max_concurrency)
 
     async def execute_download(
         self,
@@ -87,12 +137,15 @@ class DataAcquisitionService:
         if execution is None:
             raise ValueError(f"Execution {execution_id} not found")
 
-        # Track active execution
-        self._active_executions[execution_id] = {
+        # Track active execution (row counters are filled in by _store_data)
+        tracking: dict[str, Any] = {
             "interface_id": interface_id,
             "parameters": parameters,
             "started_at": datetime.now(UTC),
+            "total_rows": 0,
+            "rows_done": 0,
         }
+        self._active_executions[execution_id] = tracking
 
         try:
             # Execute akshare function
@@ -109,6 +162,8 @@ class DataAcquisitionService:
                 await db.commit()
                 return 0
 
+            tracking["total_rows"] = len(data)
+
             # Store data in database (single transaction for consistency)
             rows_affected = await self._store_data(
                 data=data,
@@ -149,11 +204,11 @@ class DataAcquisitionService:
             DataFrame with data or None
         """
         try:
-            # Get the akshare module function
-            func = getattr(ak, interface.name, None)
-
-            if func is None:
-                raise AttributeError(f"akshare function {interface.name} not found")
+            # Get the akshare module function (cached by name)
+            try:
+                func = resolve_akshare_function(interface.name)
+            except AttributeError as e:
+                raise AttributeError(f"akshare function {interface.name} not found") from e
 
             # Build arguments
             kwargs = {}
@@ -167,24 +222,26 @@ class DataAcquisitionService:
             # and avoid closure capture issues
             loop = asyncio.get_running_loop()
             call = functools.partial(func, **kwargs) if kwargs else func
-            coro = loop.run_in_executor(self._akshare_executor, call)
 
             # Apply timeout if specified
             effective_timeout = timeout if timeout and timeout > 0 else None
             if effective_timeout is None:
-                from app.core.config import settings
-
                 effective_timeout = settings.akshare_call_timeout or None
 
-            if effective_timeout:
-                try:
-                    result = await asyncio.wait_for(coro, timeout=effective_timeout)
-                except TimeoutError as e:
-                    raise TimeoutError(
-                        f"akshare function {interface.name} timed out after {effective_timeout}s"
-                    ) from e
-            else:
-                result = await coro
+            # Wait for a slot on the event loop, so queued calls neither hold an
+            # executor slot nor spend their timeout budget waiting for one
+            async with self._akshare_semaphore:
+                coro = loop.run_in_executor(self._akshare_executor, call)
+                if effective_timeout:
+                    try:
+                        result = await asyncio.wait_for(coro, timeout=effective_timeout)
+                    except TimeoutError as e:
+                        raise TimeoutError(
+                            f"akshare function {interface.name} timed out after "
+                            f"{effective_timeout}s"
+                        ) from e
+                else:
+                    result = await coro
 
             # Ensure result is DataFrame
             if not isinstance(result, pd.DataFrame):
@@ -228,30 +285,76 @@ class DataAcquisitionService:
         data.columns = self._clean_column_names(data.columns)
 
         # Create table if not exists
+        ddl_cached = self._schema_key(table_name, data) in self._known_tables
         await self._create_table_if_not_exists(
             table_name=table_name,
             data=data,
             db=db,
         )
 
-        # Insert data
-        rows_affected = await self._insert_data(
-            table_name=table_name,
-            data=data,
-            db=db,
-        )
+        try:
+            rows_affected = await self._insert_chunks(table_name, data, execution_id, db)
+        except DBAPIError as e:
+            self.forget_table(table_name)
+            if not ddl_cached:
+                raise
+            # The DDL was skipped from this process's cache, but another worker may
+            # have dropped the table since; recreate it and retry the insert once
+            logger.warning(f"Insert into {table_name} failed ({e}); recreating table and retrying")
+            tracking = self._active_executions.get(execution_id)
+            if tracking is not None:
+                tracking["rows_done"] = 0
+            await self._create_table_if_not_exists(
+                table_name=table_name,
+                data=data,
+                db=db,
+            )
+            try:
+                rows_affected = await self._insert_chunks(table_name, data, execution_id, db)
+            except Exception:
+                self.forget_table(table_name)
+                raise
+        except Exception:
+            # The table may have been dropped since it was cached; re-check next time
+            self.forget_table(table_name)
+            raise
 
-        # Update or create data table metadata
+        # Update or create data table metadata; when INSERT IGNORE skipped rows the
+        # running count may have drifted (e.g. rows deleted since), so recount then
         await self._update_table_metadata(
             table_name=table_name,
             interface_id=interface.id,
             execution_id=execution_id,
-            row_count=rows_affected,
+            rows_inserted=rows_affected,
             db=db,
+            resync=rows_affected < len(data),
         )
 
         return rows_affected
 
+    async def _insert_chunks(
+        self,
+        table_name: str,
+        data: pd.DataFrame,
+        execution_id: int,
+        db: AsyncSession,
+    ) -> int:
+        """
+        Insert data chunk by chunk.
+
+        The NULL-normalized copy and the row-hash strings built by _insert_data
+        exist for one chunk at a time, not the whole frame.
+        """
+        rows_affected = 0
+        for start in range(0, len(data), STORE_CHUNK_ROWS):
+            rows_affected += await self._insert_data(
+                table_name=table_name,
+                data=data.iloc[start : start + STORE_CHUNK_ROWS],
+                db=db,
+                execution_id=execution_id,
+            )
+        return rows_affected
+
     def _generate_table_name(self, interface_name: str) -> str:
         """Generate SQL table name from interface name."""
         return generate_table_name(interface_name)
@@ -266,24 +369,15 @@ class DataAcquisitionService:
         data: pd.DataFrame,
         db: AsyncSession,
     ) -> None:
-        """Create table if it doesn't exist."""
-        # Build CREATE TABLE statement
-        columns_defs = []
-        for col in data.columns:
-            dtype = data[col].dtype
-            if pd.api.types.is_integer_dtype(dtype):
-                sql_type = "BIGINT"
-            elif pd.api.types.is_float_dtype(dtype):
-                sql_type = "DOUBLE"
-            elif pd.api.types.is_datetime64_any_dtype(dtype):
-                sql_type = "DATETIME"
-            else:
-                # String type with 2x safety margin, min 255, max 2000
-                max_len = data[col].astype(str).str.len().max()
-                max_len = min(max(int((max_len or 1) * 2), 255), 2000)
-                sql_type = f"VARCHAR({max_len})"
+        """Create table if it doesn't exist (skipped if already done for these columns)."""
+        schema_key = self._schema_key(table_name, data)
+        if schema_key in self._known_tables:
+            return
 
-            columns_defs.append(f"{safe_column_name(col)} {sql_type}")
+        # Build CREATE TABLE statement
+        columns_defs = [
+            f"{safe_column_name(col)} {_sql_column_type(series)}" for col, series in data.items()
+        ]
 
         # Add ID, row_hash (for dedup), and timestamp columns
         all_columns = (
@@ -305,16 +399,38 @@ class DataAcquisitionService:
         """
 
         await db.execute(text(create_sql))
+        self._known_tables.add(schema_key)
+
+    @staticmethod
+    def _schema_key(table_name: str, data: pd.DataFrame) -> tuple[str, tuple[str, ...]]:
+        """Key for the DDL cache: the table and its column names (dtypes vary per frame)."""
+        return table_name, tuple(map(str, data.columns))
+
+    def forget_table(self, table_name: str) -> None:
+        """
+        Drop cached schema entries for a table so its DDL runs again.
+
+        Call this whenever this process drops the table. Other workers notice when
+        their next insert into it fails, and recreate the table before retrying.
+        """
+        self._known_tables = {key for key in self._known_tables if key[0] != table_name}
 
     async def _insert_data(
         self,
         table_name: str,
         data: pd.DataFrame,
         db: AsyncSession,
+        execution_id: int | None = None,
     ) -> int:
-        """Insert data into table using INSERT IGNORE to avoid duplicates."""
+        """
+        Insert data into table using INSERT IGNORE to avoid duplicates.
+
+        When ``execution_id`` is being tracked, its ``rows_done`` counter is
+        advanced after each statement.
+        """
         if data.empty:
             return 0
+        tracking = self._active_executions.get(execution_id) if execution_id is not None else None
 
         # Prepare data for insertion (convert NaN/NaT to None for MySQL)
         data = data.where(pd.notna(data), None)
@@ -331,30 +447,55 @@ class DataAcquisitionService:
                 axis=1,
             )
         )
-        records = data.to_dict("records")
-
-        # Build INSERT IGNORE statement (duplicates rejected by UNIQUE row_hash)
+        # Build multi-row INSERT IGNORE statements (duplicates rejected by UNIQUE row_hash)
         columns = list(data.columns)  # includes row_hash
         columns_str = ", ".join([safe_column_name(col) for col in columns])
-        placeholders = ", ".join([f":{col}" for col in columns])
-
         quoted_name = safe_table_name(table_name)
-        insert_sql = f"""
-            INSERT IGNORE INTO {quoted_name} ({columns_str})
-            VALUES ({placeholders})
-        """
 
-        # Adaptive batch size: larger batches for big datasets
-        total_records = len(records)
-        batch_size = BATCH_SIZE_LARGE if total_records > BATCH_SIZE_THRESHOLD else BATCH_SIZE_SMALL
+        if settings.akshare_bulk_load and self._dialect_name(db) == "mysql":
+            rows_inserted = await self._load_data_local_infile(quoted_name, columns_str, data, db)
+            if tracking is not None:
+                tracking["rows_done"] += len(data)
+            logger.info(f"Bulk-loaded {rows_inserted} rows into {table_name} (ignored duplicates)")
+            return rows_inserted
+
+        # Rows per statement, capped so wide frames stay under the bind-parameter limit
+        total_records = len(data)
+        batch_size = max(1, min(INSERT_BATCH_ROWS, INSERT_MAX_PARAMS // len(columns)))
         rows_inserted = 0
         flush_interval = 20000  # Flush every N rows to avoid large transaction memory
+        rows_since_flush = 0
+
+        # Every full batch reuses one statement; only the shorter tail gets its own
+        full_batch: tuple[TextClause, list[list[str]]] | None = None
 
         for i in range(0, total_records, batch_size):
-            batch = records[i : i + batch_size]
-            result = await db.execute(text(insert_sql), batch)
+            # Materialize only this slice's rows (one C-level object-array conversion
+            # rather than per-column Python iteration); they are dropped after the execute
+            batch = data.iloc[i : i + batch_size].to_numpy(dtype=object).tolist()
+            if len(batch) == batch_size:
+                if full_batch is None:
+                    full_batch = self._build_multirow_insert(
+                        quoted_name, columns_str, len(columns), batch_size
+                    )
+                stmt, param_names = full_batch
+            else:
+                stmt, param_names = self._build_multirow_insert(
+                    quoted_name, columns_str, len(columns), len(batch)
+                )
+            params = {
+                name: value
+                for names, row in zip(param_names, batch, strict=True)
+                for name, value in zip(names, row, strict=True)
+            }
+            result = await db.execute(stmt, params)
             rows_inserted += get_rowcount(result)
-            if i > 0 and i % flush_interval == 0:
+            if tracking is not None:
+                tracking["rows_done"] += len(batch)
+            # Count rows rather than test i, since batch_size need not divide the interval
+            rows_since_flush += len(batch)
+            if rows_since_flush >= flush_interval:
+                rows_since_flush = 0
                 await db.flush()
                 logger.debug(
                     f"Insert progress: {i + len(batch)}/{total_records} "
@@ -365,25 +506,113 @@ class DataAcquisitionService:
         logger.info(f"Inserted {rows_inserted} rows into {table_name} (ignored duplicates)")
         return rows_inserted
 
+    @staticmethod
+    def _dialect_name(db: AsyncSession) -> str | None:
+        """Return the SQL dialect name the session is bound to, if known."""
+        bind = getattr(db, "bind", None)
+        name = getattr(getattr(bind, "dialect", None), "name", None)
+        return name if isinstance(name, str) else None
+
+    async def _load_data_local_infile(
+        self,
+        quoted_name: str,
+        columns_str: str,
+        data: pd.DataFrame,
+        db: AsyncSession,
+    ) -> int:
+        """
+        Bulk-load rows through a temporary file with ``LOAD DATA LOCAL INFILE``.
+
+        Duplicate rows are skipped by ``IGNORE`` against the UNIQUE row_hash key,
+        matching the ``INSERT IGNORE`` path.
+
+        Args:
+            quoted_name: Quoted target table name
+            columns_str: Comma-separated quoted column list
+            data: Rows to load, columns in ``columns_str`` order
+            db: Database session
+
+        Returns:
+            Number of rows inserted
+        """
+
+        def _write_file() -> str:
+            with tempfile.NamedTemporaryFile(
+                "w", suffix=".tsv", encoding="utf-8", newline="", delete=False
+            ) as f:
+                for row in data.itertuples(index=False, name=None):
+                    f.write("\t".join(_load_data_field(v) for v in row))
+                    f.write("\n")
+                return f.name
+
+        path = await asyncio.to_thread(_write_file)
+        try:
+            result = await db.execute(
+                text(
+                    f"LOAD DATA LOCAL INFILE :path IGNORE INTO TABLE {quoted_name} "
+                    f"CHARACTER SET utf8mb4 ({columns_str})"
+                ),
+                {"path": path},
+            )
+            return get_rowcount(result)
+        finally:
+            Path(path).unlink(missing_ok=True)
+
+    @staticmethod
+    def _build_multirow_insert(
+        quoted_name: str,
+        columns_str: str,
+        n_columns: int,
+        n_rows: int,
+    ) -> tuple[TextClause, list[list[str]]]:
+        """
+        Build an ``INSERT IGNORE ... VALUES (...), (...)`` statement for ``n_rows`` rows.
+
+        Args:
+            quoted_name: Quoted target table name
+            columns_str: Comma-separated quoted column list
+            n_columns: Number of columns per row
+            n_rows: Number of rows in the statement
+
+        Returns:
+            Tuple of (statement, bind-parameter names per row in column order)
+        """
+        param_names = [[f"p{i}_{j}" for j in range(n_columns)] for i in range(n_rows)]
+        values = ", ".join(
+            "(" + ", ".join(f":{name}" for name in names) + ")" for names in param_names
+        )
+        stmt = text(f"INSERT IGNORE INTO {quoted_name} ({columns_str}) VALUES {values}")
+        return stmt, param_names
+
     async def _update_table_metadata(
         self,
         table_name: str,
         interface_id: int,
         execution_id: int,
-        row_count: int,
+        rows_inserted: int,
         db: AsyncSession,
+        resync: bool = False,
     ) -> None:
-        """Update data table metadata record."""
+        """
+        Update data table metadata record.
+
+        An existing record's row count is advanced by ``rows_inserted``; the
+        table is only scanned with ``COUNT(*)`` when the record is new or
+        ``resync`` is requested.
+        """
         from sqlalchemy import select
 
         # Get existing metadata
         result = await db.execute(select(DataTable).where(DataTable.table_name == table_name))
         table_meta = result.scalar_one_or_none()
 
-        # Get current total row count
-        quoted_name = safe_table_name(table_name)
-        count_result = await db.execute(text(f"SELECT COUNT(*) FROM {quoted_name}"))
-        total_rows = count_result.scalar() or 0
+        if table_meta and not resync:
+            total_rows = (table_meta.row_count or 0) + rows_inserted
+        else:
+            # Get current total row count
+            quoted_name = safe_table_name(table_name)
+            count_result = await db.execute(text(f"SELECT COUNT(*) FROM {quoted_name}"))
+            total_rows = count_result.scalar() or 0
 
         if table_meta:
             # Update existing
@@ -413,19 +642,25 @@ class DataAcquisitionService:
         Returns:
             Progress information dict
         """
-        if execution_id not in self._active_executions:
+        # Single atomic read: the entry may be popped concurrently by execute_download
+        info = self._active_executions.get(execution_id)
+        if info is None:
             return {
                 "execution_id": execution_id,
                 "status": "not_found",
                 "progress": 0,
             }
 
-        info = self._active_executions[execution_id]
+        total_rows = info.get("total_rows", 0)
+        rows_done = info.get("rows_done", 0)
         return {
             "execution_id": execution_id,
             "status": "running",
             "interface_id": info.get("interface_id"),
             "started_at": info.get("started_at"),
+            "total_rows": total_rows,
+            "rows_done": rows_done,
+            "progress": round(rows_done * 100 / total_rows, 1) if total_rows else 0,
         }
 
     def cancel_execution(self, execution_id: int) -> bool:
@@ -438,10 +673,13 @@ class DataAcquisitionService:
         Returns:
             True if cancelled, False otherwise
         """
-        if execution_id in self._active_executions:
-            self._active_executions.pop(execution_id, None)
-            return True
-        return False
+        return self._active_executions.pop(execution_id, None) is not None
+
+
+@functools.lru_cache
+def get_data_acquisition_service() -> DataAcquisitionService:
+    """Get the shared service instance (keeps its schema and lookup caches warm)."""
+    return DataAcquisitionService()
 
 
 # Note: asyncio import moved to top of file
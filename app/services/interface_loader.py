@@ -4,6 +4,7 @@ Interface loader service.
 Discovers and loads akshare data interface definitions.
 """
 
+import functools
 import inspect
 from typing import Any
 
@@ -21,6 +22,26 @@ from app.models.interface import (
 )
 
 
+@functools.lru_cache(maxsize=1)
+def _akshare_functions() -> tuple[tuple[str, Any], ...]:
+    """
+    Scan akshare for its public callables.
+
+    Reads the module ``__dict__`` directly rather than doing a ``getattr``
+    per name, and caches the result for the process. Call
+    ``_akshare_functions.cache_clear()`` after patching ``ak``.
+    """
+    # Public callables, sorted by name like dir(ak)
+    functions = [
+        (name, attr)
+        for name, attr in sorted(vars(ak).items())
+        if not name.startswith("_") and callable(attr)
+    ]
+
+    logger.info(f"Discovered {len(functions)} functions in akshare")
+    return tuple(functions)
+
+
 class InterfaceLoader:
     """
     Service for loading akshare interfaces into the database.
@@ -103,17 +124,7 @@ class InterfaceLoader:
         Returns:
             List of (function_name, function) tuples
         """
-        functions = []
-
-        # Get all public attributes
-        for name in dir(ak):
-            if not name.startswith("_"):
-                attr = getattr(ak, name)
-                if callable(attr):
-                    functions.append((name, attr))
-
-        logger.info(f"Discovered {len(functions)} functions in akshare")
-        return functions
+        return list(_akshare_functions())
 
     async def _load_interface(
         self,
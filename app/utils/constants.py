@@ -7,10 +7,10 @@ Centralizes magic numbers and string literals for maintainability.
 # Security - default secret key (must be overridden in production)
 DEFAULT_SECRET_KEY = "your-secret-key-change-this-in-production"
 
-# Data acquisition batch sizes
-BATCH_SIZE_LARGE = 5000  # For large datasets (> 10k rows)
-BATCH_SIZE_SMALL = 2000  # For smaller datasets
-BATCH_SIZE_THRESHOLD = 10000  # Threshold to switch batch sizes
+# Data acquisition multi-row INSERT batching
+INSERT_BATCH_ROWS = 1000  # Rows per multi-row INSERT statement
+INSERT_MAX_PARAMS = 60000  # Cap on bind parameters per statement (wide frames)
+STORE_CHUNK_ROWS = 50000  # Rows prepared (NULL handling, row hashes) per insert pass
 
 # CSV export
 CSV_EXPORT_BATCH_SIZE = 10000
@@ -7,6 +7,10 @@ Provides common utility functions used across the application.
 import re
 from typing import Any
 
+_COLUMN_NAME_INVALID_CHARS = re.compile(r"[^a-z0-9]+")
+_TABLE_NAME_SEPARATORS = str.maketrans(".-", "__")
+_TABLE_NAME_INVALID_CHARS = re.compile(r"[^a-zA-Z0-9_]+")
+
 
 def generate_table_name(interface_name: str, prefix: str = "ak_") -> str:
     """
@@ -19,17 +23,13 @@ def generate_table_name(interface_name: str, prefix: str = "ak_") -> str:
     Returns:
         Safe SQL table name
     """
-    # Replace dots and special characters with underscores
-    clean_name = interface_name.replace(".", "_").replace("-", "_")
-    # Remove any remaining non-alphanumeric characters except underscore
-    clean_name = re.sub(r"[^a-zA-Z0-9_]", "", clean_name)
+    # Map dots and dashes to underscores, then drop any other invalid characters
+    clean_name = _TABLE_NAME_INVALID_CHARS.sub("", interface_name.translate(_TABLE_NAME_SEPARATORS))
     # Ensure it doesn't start with a number
-    if clean_name and clean_name[0].isdigit():
+    if clean_name[:1].isdigit():
         clean_name = f"t_{clean_name}"
     # Limit length
-    if len(clean_name) > 60:
-        clean_name = clean_name[:60]
-    return f"{prefix}{clean_name}"
+    return f"{prefix}{clean_name[:60]}"
 
 
 def clean_column_names(columns: list[str] | Any) -> list[str]:  # noqa: ANN401
@@ -42,24 +42,12 @@ def clean_column_names(columns: list[str] | Any) -> list[str]:  # noqa: ANN401
     Returns:
         List of cleaned column names
     """
-    cleaned = []
-    for col in columns:
-        # Convert to string
-        col_str = str(col)
-        # Lowercase
-        col_str = col_str.lower()
-        # Replace spaces and special characters with underscore
-        col_str = re.sub(r"[^a-zA-Z0-9]+", "_", col_str)
-        # Remove leading/trailing underscores
-        col_str = col_str.strip("_")
-        # Limit length
-        if len(col_str) > 64:
-            col_str = col_str[:64]
-        # Ensure non-empty
-        if not col_str:
-            col_str = "column"
-        cleaned.append(col_str)
-    return cleaned
+    # One pass per name: lowercase, fold each run of non-alphanumerics to "_",
+    # strip edge underscores, cap at 64 chars, fall back to "column" if empty
+    return [
+        _COLUMN_NAME_INVALID_CHARS.sub("_", str(col).lower()).strip("_")[:64] or "column"
+        for col in columns
+    ]
 
 
 def format_size(size_bytes: int | None) -> str:
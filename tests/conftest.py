@@ -5,67 +5,252 @@ Provides shared test fixtures for all test modules.
 """
 
 import asyncio
+import functools
 import os
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
 
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
 
-from app.core.database import Base, get_data_db, get_db
-from app.main import app
-
-# Set testing environment variable to disable rate limiting
+# Set before any app import: TESTING disables rate limiting, and APP_ENV=testing
+# makes the app engines use NullPool without pre-ping (see _engine_options)
 os.environ["TESTING"] = "true"
+os.environ["APP_ENV"] = "testing"
+
+from app.core.database import Base, get_data_db, get_db  # noqa: E402
 
+# Importing the app here builds it (routers, services, akshare, pandas) once,
+# before collection, so no test pays the cold-import cost depending on order.
+from app.main import app  # noqa: E402
 
 # Test database URL
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+_SQLITE_PRAGMAS = (
+    "PRAGMA synchronous=OFF",
+    "PRAGMA journal_mode=MEMORY",
+    "PRAGMA temp_store=MEMORY",
+)
 
 
 @pytest.fixture(scope="session", autouse=True)
 def event_loop_policy() -> asyncio.AbstractEventLoopPolicy:
-    """Set event loop policy for the entire test session."""
-    policy = asyncio.DefaultEventLoopPolicy()
+    """Set event loop policy for the entire test session.
+
+    Uses uvloop (installed with ``uvicorn[standard]`` outside Windows) when
+    available, falling back to the default asyncio loop.
+    """
+    try:
+        import uvloop
+
+        policy = uvloop.EventLoopPolicy()
+    except ImportError:
+        policy = asyncio.DefaultEventLoopPolicy()
     asyncio.set_event_loop_policy(policy)
     yield policy
     # Clean up
     asyncio.set_event_loop_policy(None)
 
 
-@pytest_asyncio.fixture(scope="function")
-async def test_engine():
-    """Create test database engine."""
+def _create_test_engine():
+    """Create the SQLite test engine with durability turned off.
+
+    StaticPool keeps the single in-memory connection (and its schema) alive
+    across sessions, with no pre-ping or recycling on checkout; the PRAGMAs
+    skip fsync and on-disk journals, which matters if ``TEST_DATABASE_URL``
+    is ever pointed at a file.
+    """
     engine = create_async_engine(
         TEST_DATABASE_URL,
         echo=False,
+        poolclass=StaticPool,
+        pool_pre_ping=False,
+        pool_recycle=-1,
+        connect_args={"check_same_thread": False},
     )
 
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+        # pysqlite's implicit transaction handling breaks SAVEPOINT; take
+        # over BEGIN ourselves so nested transactions behave as on a server.
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    return engine
+
+
+@asynccontextmanager
+async def _rollback_session(conn) -> AsyncIterator[AsyncSession]:
+    """Open a session on ``conn`` whose writes are rolled back on exit.
+
+    Commits made by the code under test only release a SAVEPOINT, so the
+    outer transaction can discard everything the test wrote.
+    """
+    transaction = await conn.begin()
+    session = AsyncSession(
+        bind=conn,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    )
+    try:
+        yield session
+    finally:
+        await session.close()
+        await transaction.rollback()
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def test_engine():
+    """Create the test database engine and schema once per session."""
+    engine = _create_test_engine()
+
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
     yield engine
 
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
-
     await engine.dispose()
 
 
 @pytest_asyncio.fixture(scope="function")
 async def test_db(test_engine) -> AsyncGenerator[AsyncSession, None]:
-    """Create test database session."""
-    async_session_maker = async_sessionmaker(
-        test_engine,
-        class_=AsyncSession,
-        expire_on_commit=False,
-    )
+    """Create a test database session, rolled back after the test."""
+    async with test_engine.connect() as conn, _rollback_session(conn) as session:
+        yield session
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def test_db_module():
+    """Module-wide database connection with the schema created once.
+
+    Tests using it must run on the module event loop
+    (``pytestmark = pytest.mark.asyncio(loop_scope="module")``).
+    """
+    engine = _create_test_engine()
+
+    async with engine.connect() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.commit()
+        yield conn
+
+    await engine.dispose()
 
-    async with async_session_maker() as session:
+
+@pytest_asyncio.fixture(loop_scope="module")
+async def shared_db(test_db_module) -> AsyncGenerator[AsyncSession, None]:
+    """Per-test session on the module connection, rolled back on teardown.
+
+    Each test sees the module fixtures but none of the rows earlier tests
+    wrote.
+    """
+    async with _rollback_session(test_db_module) as session:
         yield session
 
 
+@functools.cache
+def _password_hash(password: str) -> str:
+    """bcrypt-hash ``password`` once per process; the hash still verifies."""
+    from app.core.security import hash_password
+
+    return hash_password(password)
+
+
+@pytest.fixture(scope="session")
+def password_hash():
+    """The cached ``_password_hash``, for test modules that build their own users."""
+    return _password_hash
+
+
+async def _commit_module_row(conn, row):
+    """Persist ``row`` on the module connection outside any test transaction."""
+    async with AsyncSession(bind=conn, expire_on_commit=False) as session:
+        session.add(row)
+        await session.commit()
+        await session.refresh(row)
+    return row
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def shared_user(test_db_module):
+    """One regular user shared by every test in the module."""
+    from app.models.user import User, UserRole
+
+    return await _commit_module_row(
+        test_db_module,
+        User(
+            username="shared_user",
+            email="shared_user@example.com",
+            hashed_password=_password_hash("Password123!"),
+            role=UserRole.USER,
+            is_active=True,
+        ),
+    )
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def shared_admin(test_db_module):
+    """One admin user shared by every test in the module."""
+    from app.models.user import User, UserRole
+
+    return await _commit_module_row(
+        test_db_module,
+        User(
+            username="shared_admin",
+            email="shared_admin@example.com",
+            hashed_password=_password_hash("AdminPass123!"),
+            role=UserRole.ADMIN,
+            is_active=True,
+        ),
+    )
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def shared_category(test_db_module):
+    """One interface category shared by every test in the module."""
+    from app.models.interface import InterfaceCategory
+
+    return await _commit_module_row(
+        test_db_module,
+        InterfaceCategory(name="shared_category", description="Shared", sort_order=1),
+    )
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def shared_task(test_db_module, shared_user):
+    """One scheduled task, owned by ``shared_user``, shared by the module."""
+    from app.models.task import ScheduledTask, ScheduleType
+
+    return await _commit_module_row(
+        test_db_module,
+        ScheduledTask(
+            name="shared_task",
+            user_id=shared_user.id,
+            script_id="shared_script",
+            schedule_type=ScheduleType.CRON,
+            schedule_expression="0 8 * * *",
+            parameters={},
+        ),
+    )
+
+
+@pytest.fixture(scope="session")
+def main_app():
+    """The application instance built at conftest import, shared by the session."""
+    return app
+
+
 @pytest_asyncio.fixture(scope="function")
 async def test_client(test_db):
     """Create test client with database override."""
@@ -107,13 +292,43 @@ def _clear_blacklist(bl):
 def _clear_test_state():
     """Clear shared state before each test."""
     from app.core.token_blacklist import token_blacklist
+    from app.services.data_acquisition import resolve_akshare_function
     from app.utils.cache import api_cache
 
     _clear_blacklist(token_blacklist)
     api_cache.clear()
+    resolve_akshare_function.cache_clear()
     yield
     _clear_blacklist(token_blacklist)
     api_cache.clear()
+    resolve_akshare_function.cache_clear()
+
+
+@pytest.fixture(scope="session")
+def interface_loader():
+    """One InterfaceLoader for the whole session; tests only read from it."""
+    from app.services.interface_loader import InterfaceLoader
+
+    return InterfaceLoader()
+
+
+# Fixed instant returned by the execution service's clock under ``frozen_now``.
+FROZEN_NOW = datetime(2024, 1, 1, 12, 0, tzinfo=UTC)
+
+
+class _FrozenDatetime(datetime):
+    """``datetime`` whose ``now()`` always returns ``FROZEN_NOW``."""
+
+    @classmethod
+    def now(cls, tz=None):
+        return FROZEN_NOW.astimezone(tz) if tz else FROZEN_NOW.replace(tzinfo=None)
+
+
+@pytest.fixture
+def frozen_now(monkeypatch):
+    """Freeze ``datetime.now()`` inside the execution service."""
+    monkeypatch.setattr("app.services.execution_service.datetime", _FrozenDatetime)
+    return FROZEN_NOW
 
 
 @pytest.fixture
@@ -161,13 +376,12 @@ test_user_token = test_user
 
 async def _create_admin_and_login(test_client, test_db, email, password):
     """Helper: create admin user directly and return access token."""
-    from app.core.security import hash_password
     from app.models.user import User, UserRole
 
     admin = User(
         username=email.split("@")[0],
         email=email,
-        hashed_password=hash_password(password),
+        hashed_password=_password_hash(password),
         role=UserRole.ADMIN,
         is_active=True,
     )
@@ -4,7 +4,23 @@ Core module tests.
 Tests for core functionality including database and security.
 """
 
-from datetime import UTC, datetime
+import inspect
+import time
+from types import SimpleNamespace
+
+import pytest
+from starlette.middleware.cors import CORSMiddleware
+
+# Hash prefixes emitted by the various bcrypt backends
+_BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+
+
+@pytest.fixture(scope="session")
+def long_password_hash():
+    """Hash of a 100-byte password, computed once per session."""
+    from app.core.security import hash_password
+
+    return hash_password("a" * 100)
 
 
 class TestCoreSecurity:
@@ -52,6 +68,7 @@ class TestCoreSecurity:
 
         assert PermissionChecker is not None
 
+    @pytest.mark.slow
     def test_get_password_hash(self):
         """Test getting password hash."""
         from app.core.security import hash_password
@@ -61,9 +78,9 @@ class TestCoreSecurity:
 
         assert hashed != password
         assert len(hashed) > 20
-        # bcrypt hashes start with $2b$
-        assert hashed.startswith("$2b$")
+        assert hashed.startswith(_BCRYPT_PREFIXES)
 
+    @pytest.mark.slow
     def test_verify_correct_password(self):
         """Test verifying correct password."""
         from app.core.security import hash_password, verify_password
@@ -73,6 +90,7 @@ class TestCoreSecurity:
 
         assert verify_password(password, hashed) is True
 
+    @pytest.mark.slow
     def test_verify_incorrect_password(self):
         """Test verifying incorrect password."""
         from app.core.security import hash_password, verify_password
@@ -165,20 +183,24 @@ class TestCoreSecurity:
         assert "exp" in decoded
 
         # exp should be in the future
-        exp_timestamp = decoded["exp"]
-        now_timestamp = datetime.now(UTC).timestamp()
-        assert exp_timestamp > now_timestamp
+        assert decoded["exp"] > time.time()
 
-    def test_password_truncation_long_password(self):
+    @pytest.mark.slow
+    def test_password_truncation_long_password(self, long_password_hash):
         """Test that long passwords are truncated (bcrypt 72 byte limit)."""
-        from app.core.security import hash_password, verify_password
+        from app.core.security import verify_password
+
+        # The full 100-byte password still verifies against its own hash
+        assert verify_password("a" * 100, long_password_hash) is True
+        # ...and so does its 72-byte prefix, since bcrypt only sees the first 72 bytes
+        assert verify_password("a" * 72, long_password_hash) is True
 
-        # Create a password longer than 72 bytes
-        long_password = "a" * 100
-        hashed = hash_password(long_password)
+    @pytest.mark.slow
+    def test_password_truncation_keeps_72_bytes(self, long_password_hash):
+        """Test that truncation keeps the full 72 bytes, not fewer."""
+        from app.core.security import verify_password
 
-        # Should still verify correctly with the same long password
-        assert verify_password(long_password, hashed) is True
+        assert verify_password("a" * 71, long_password_hash) is False
 
 
 class TestPermissionChecker:
@@ -254,35 +276,36 @@ class TestPermissionChecker:
         assert can_modify is False
 
 
+@pytest.fixture(scope="session")
+def core_database():
+    """The app.core.database objects under test, imported once per session."""
+    from app.core.database import Base, async_session_maker, engine, get_db
+
+    return SimpleNamespace(
+        engine=engine, Base=Base, async_session_maker=async_session_maker, get_db=get_db
+    )
+
+
+@pytest.mark.db
 class TestCoreDatabase:
     """Test core database functions."""
 
-    def test_engine_exists(self):
+    def test_engine_exists(self, core_database):
         """Test database engine exists."""
-        from app.core.database import engine
-
-        assert engine is not None
+        assert core_database.engine is not None
 
-    def test_base_exists(self):
+    def test_base_exists(self, core_database):
         """Test Base metadata exists."""
-        from app.core.database import Base
-
-        assert Base is not None
-        assert hasattr(Base, "metadata")
+        assert core_database.Base is not None
+        assert hasattr(core_database.Base, "metadata")
 
-    def test_async_session_maker_exists(self):
+    def test_async_session_maker_exists(self, core_database):
         """Test async session maker exists."""
-        from app.core.database import async_session_maker
+        assert core_database.async_session_maker is not None
 
-        assert async_session_maker is not None
-
-    def test_get_db_function_exists(self):
+    def test_get_db_function_exists(self, core_database):
         """Test get_db function exists."""
-        import inspect
-
-        from app.core.database import get_db
-
-        assert inspect.isasyncgenfunction(get_db)
+        assert inspect.isasyncgenfunction(core_database.get_db)
 
 
 class TestCoreConfig:
@@ -337,6 +360,12 @@ class TestCoreConfig:
         assert isinstance(settings.cors_origins, list)
 
 
+@pytest.fixture(scope="session")
+def app_routes(main_app):
+    """Routes with a path, collected once from the shared app."""
+    return [r for r in main_app.routes if hasattr(r, "path")]
+
+
 class TestMainApp:
     """Test main application setup."""
 
@@ -352,17 +381,12 @@ class TestMainApp:
 
         assert "akshare_web" in app.title
 
-    def test_app_has_routes(self):
+    def test_app_has_routes(self, app_routes):
         """Test app has routes."""
-        from app.main import app
-
-        routes = [r for r in app.routes if hasattr(r, "path")]
-        assert len(routes) > 0
+        assert len(app_routes) > 0
 
     def test_app_has_cors_middleware(self):
         """Test app has CORS middleware."""
         from app.main import app
 
-        # Check for CORS middleware in middleware stack
-        has_cors = any("CORSMiddleware" in str(m) for m in app.user_middleware)
-        assert has_cors
+        assert any(m.cls is CORSMiddleware for m in app.user_middleware)
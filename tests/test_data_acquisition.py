@@ -4,7 +4,14 @@ Data acquisition service tests.
 Tests for the data acquisition service module.
 """
 
-from unittest.mock import AsyncMock
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.models.data_script import DataScript
+from app.models.data_table import DataTable
+from app.models.interface import DataInterface
+from app.models.task import ScheduledTask, TaskExecution
 
 
 class TestDataAcquisitionService:
@@ -54,7 +61,7 @@ class TestScriptService:
         """Test ScriptService can be initialized."""
         from app.services.script_service import ScriptService
 
-        mock_db = AsyncMock()
+        mock_db = MagicMock()
         service = ScriptService(mock_db)
 
         assert service is not None
@@ -73,7 +80,7 @@ class TestExecutionService:
         """Test ExecutionService can be initialized."""
         from app.services.execution_service import ExecutionService
 
-        mock_db = AsyncMock()
+        mock_db = MagicMock()
         service = ExecutionService(mock_db)
 
         assert service is not None
@@ -88,24 +95,6 @@ class TestTaskModel:
 
         assert ScheduledTask is not None
 
-    def test_task_has_required_fields(self):
-        """Test Task has required fields."""
-        from app.models.task import ScheduledTask
-
-        # Check model has expected attributes
-        expected_attrs = [
-            "id",
-            "name",
-            "script_id",
-            "schedule_type",
-            "schedule_expression",
-            "is_active",
-            "created_at",
-        ]
-
-        for attr in expected_attrs:
-            assert hasattr(ScheduledTask, attr)
-
     def test_task_status_enum(self):
         """Test TaskStatus enum exists."""
         from app.models.task import TaskStatus
@@ -144,22 +133,6 @@ class TestTaskExecutionModel:
 
         assert TaskExecution is not None
 
-    def test_execution_has_fields(self):
-        """Test TaskExecution has expected fields."""
-        from app.models.task import TaskExecution
-
-        expected_fields = [
-            "execution_id",
-            "task_id",
-            "status",
-            "start_time",
-            "end_time",
-            "created_at",
-        ]
-
-        for field in expected_fields:
-            assert hasattr(TaskExecution, field)
-
 
 class TestDataScriptModel:
     """Test DataScript model."""
@@ -170,22 +143,6 @@ class TestDataScriptModel:
 
         assert DataScript is not None
 
-    def test_script_has_fields(self):
-        """Test DataScript has expected fields."""
-        from app.models.data_script import DataScript
-
-        expected_fields = [
-            "script_id",
-            "script_name",
-            "category",
-            "frequency",
-            "is_active",
-            "created_at",
-        ]
-
-        for field in expected_fields:
-            assert hasattr(DataScript, field)
-
 
 class TestDataTableModel:
     """Test DataTable model."""
@@ -196,15 +153,6 @@ class TestDataTableModel:
 
         assert DataTable is not None
 
-    def test_table_has_fields(self):
-        """Test DataTable has expected fields."""
-        from app.models.data_table import DataTable
-
-        expected_fields = ["id", "table_name", "table_comment", "row_count", "created_at"]
-
-        for field in expected_fields:
-            assert hasattr(DataTable, field)
-
 
 class TestInterfaceModel:
     """Test DataInterface model."""
@@ -215,11 +163,38 @@ class TestInterfaceModel:
 
         assert DataInterface is not None
 
-    def test_interface_has_fields(self):
-        """Test DataInterface has expected fields."""
-        from app.models.interface import DataInterface
-
-        expected_fields = ["id", "name", "display_name", "category", "is_active", "created_at"]
 
-        for field in expected_fields:
-            assert hasattr(DataInterface, field)
+class TestModelFields:
+    """Test models expose their expected mapped attributes."""
+
+    @pytest.mark.parametrize(
+        ("model", "fields"),
+        [
+            (
+                ScheduledTask,
+                {
+                    "id",
+                    "name",
+                    "script_id",
+                    "schedule_type",
+                    "schedule_expression",
+                    "is_active",
+                    "created_at",
+                },
+            ),
+            (
+                TaskExecution,
+                {"execution_id", "task_id", "status", "start_time", "end_time", "created_at"},
+            ),
+            (
+                DataScript,
+                {"script_id", "script_name", "category", "frequency", "is_active", "created_at"},
+            ),
+            (DataTable, {"id", "table_name", "table_comment", "row_count", "created_at"}),
+            (DataInterface, {"id", "name", "display_name", "category", "is_active", "created_at"}),
+        ],
+        ids=lambda v: v.__name__ if isinstance(v, type) else "",
+    )
+    def test_model_has_fields(self, model, fields):
+        """Test model mapper has all expected attributes."""
+        assert fields <= set(model.__mapper__.attrs.keys())
@@ -3,13 +3,20 @@ Tests for DataAcquisitionService covering execute_download, _store_data,
 _create_table_if_not_exists, _insert_data, _update_table_metadata.
 """
 
+import asyncio
+from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pandas as pd
 import pytest
+from sqlalchemy.exc import ProgrammingError
 
 from app.models.task import TaskStatus
-from app.services.data_acquisition import DataAcquisitionService
+from app.services.data_acquisition import (
+    DataAcquisitionService,
+    _load_data_field,
+    resolve_akshare_function,
+)
 
 
 @pytest.fixture
@@ -156,6 +163,38 @@ class TestCallAkshareFunction:
 
         assert result is None
 
+    @pytest.mark.asyncio
+    async def test_function_lookup_is_cached(self, svc):
+        mock_interface = MagicMock()
+        mock_interface.name = "stock_data"
+        df = pd.DataFrame({"a": [1]})
+
+        with patch("app.services.data_acquisition.ak") as mock_ak:
+            mock_ak.stock_data = MagicMock(return_value=df)
+            await svc._call_akshare_function(mock_interface, {})
+            await svc._call_akshare_function(mock_interface, {})
+
+        # The autouse fixture clears the cache, so the second lookup is the only hit
+        info = resolve_akshare_function.cache_info()
+        assert (info.misses, info.hits) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_calls_wait_for_semaphore(self, svc):
+        mock_interface = MagicMock()
+        mock_interface.name = "stock_data"
+        svc._akshare_semaphore = asyncio.Semaphore(1)
+
+        with patch("app.services.data_acquisition.ak") as mock_ak:
+            mock_ak.stock_data = MagicMock(return_value=pd.DataFrame({"a": [1]}))
+            async with svc._akshare_semaphore:
+                task = asyncio.create_task(svc._call_akshare_function(mock_interface, {}))
+                await asyncio.sleep(0.01)
+                assert not task.done()
+                mock_ak.stock_data.assert_not_called()
+            result = await task
+
+        assert isinstance(result, pd.DataFrame)
+
 
 class TestStoreData:
     @pytest.mark.asyncio
@@ -175,6 +214,66 @@ class TestStoreData:
 
         assert result == 2
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(("inserted", "resync"), [(3, False), (1, True)])
+    async def test_store_data_resyncs_count_when_rows_skipped(self, svc, inserted, resync):
+        mock_db = AsyncMock()
+        mock_interface = MagicMock()
+        mock_interface.name = "test_func"
+        mock_interface.id = 1
+        df = pd.DataFrame({"col_a": [1, 2, 3]})
+
+        with (
+            patch.object(svc, "_create_table_if_not_exists", new_callable=AsyncMock),
+            patch.object(svc, "_insert_data", new_callable=AsyncMock, return_value=inserted),
+            patch.object(svc, "_update_table_metadata", new_callable=AsyncMock) as mock_meta,
+        ):
+            await svc._store_data(df, mock_interface, 1, mock_db)
+
+        assert mock_meta.call_args.kwargs["resync"] is resync
+
+    @pytest.mark.asyncio
+    async def test_store_data_inserts_in_chunks(self, svc):
+        mock_db = AsyncMock()
+        mock_interface = MagicMock()
+        mock_interface.name = "test_func"
+        mock_interface.id = 1
+        df = pd.DataFrame({"col_a": range(5)})
+
+        with (
+            patch("app.services.data_acquisition.STORE_CHUNK_ROWS", 2),
+            patch.object(svc, "_create_table_if_not_exists", new_callable=AsyncMock),
+            patch.object(
+                svc, "_insert_data", new_callable=AsyncMock, side_effect=[2, 2, 1]
+            ) as mock_insert,
+            patch.object(svc, "_update_table_metadata", new_callable=AsyncMock),
+        ):
+            result = await svc._store_data(df, mock_interface, 1, mock_db)
+
+        assert result == 5
+        chunk_sizes = [len(c.kwargs["data"]) for c in mock_insert.call_args_list]
+        assert chunk_sizes == [2, 2, 1]
+
+    @pytest.mark.asyncio
+    async def test_store_data_counts_progress_per_batch(self, svc):
+        mock_interface = MagicMock()
+        mock_interface.name = "test_func"
+        mock_interface.id = 1
+        tracking = {"total_rows": 2500, "rows_done": 0}
+        svc._active_executions[1] = tracking
+        progress = []
+        mock_db = AsyncMock()
+        # The first execute is the DDL; each later one is an insert batch
+        mock_db.execute.side_effect = lambda *args: progress.append(tracking["rows_done"])
+        df = pd.DataFrame({"col_a": range(2500)})
+
+        with patch.object(svc, "_update_table_metadata", new_callable=AsyncMock):
+            await svc._store_data(df, mock_interface, 1, mock_db)
+
+        # Downloads smaller than one store chunk still report progress between batches
+        assert progress == [0, 0, 1000, 2000]
+        assert tracking["rows_done"] == 2500
+
 
 class TestCreateTableIfNotExists:
     @pytest.mark.asyncio
@@ -206,6 +305,101 @@ class TestCreateTableIfNotExists:
         await svc._create_table_if_not_exists("ak_test", df, mock_db)
         mock_db.execute.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_column_types(self, svc):
+        mock_db = AsyncMock()
+        df = pd.DataFrame(
+            {
+                "count": [1, 2],
+                "volume": pd.array([1, None], dtype="Int64"),
+                "price": [1.5, 2.5],
+                "date": pd.to_datetime(["2024-01-01", "2024-01-02"]),
+                "name": ["abc", "def"],
+                "flag": [True, False],
+            }
+        )
+        await svc._create_table_if_not_exists("ak_test", df, mock_db)
+        ddl = str(mock_db.execute.call_args.args[0])
+        assert "`count` BIGINT" in ddl
+        assert "`volume` BIGINT" in ddl
+        assert "`price` DOUBLE" in ddl
+        assert "`date` DATETIME" in ddl
+        assert "`name` VARCHAR(255)" in ddl
+        assert "`flag` VARCHAR(255)" in ddl
+
+    @pytest.mark.asyncio
+    async def test_same_schema_skips_ddl(self, svc):
+        mock_db = AsyncMock()
+        df = pd.DataFrame({"price": [1.5, 2.5]})
+        await svc._create_table_if_not_exists("ak_test", df, mock_db)
+        await svc._create_table_if_not_exists("ak_test", df, mock_db)
+        mock_db.execute.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_new_schema_reruns_ddl(self, svc):
+        mock_db = AsyncMock()
+        await svc._create_table_if_not_exists("ak_test", pd.DataFrame({"a": [1]}), mock_db)
+        await svc._create_table_if_not_exists("ak_test", pd.DataFrame({"b": [1]}), mock_db)
+        assert mock_db.execute.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_insert_forgets_table(self, svc):
+        mock_db = AsyncMock()
+        mock_interface = MagicMock()
+        mock_interface.name = "test_func"
+        df = pd.DataFrame({"col_a": [1, 2]})
+
+        with (
+            patch.object(svc, "_insert_data", new_callable=AsyncMock, side_effect=RuntimeError),
+            pytest.raises(RuntimeError),
+        ):
+            await svc._store_data(df, mock_interface, 1, mock_db)
+
+        assert svc._known_tables == set()
+
+    @pytest.mark.asyncio
+    async def test_insert_into_dropped_cached_table_recreates_and_retries(self, svc):
+        mock_db = AsyncMock()
+        mock_interface = MagicMock()
+        mock_interface.name = "test_func"
+        df = pd.DataFrame({"col_a": [1, 2]})
+        # Another worker dropped the table after this one cached its DDL
+        missing = ProgrammingError("INSERT", {}, Exception("Table doesn't exist"))
+
+        with (
+            patch.object(svc, "_insert_data", new_callable=AsyncMock, side_effect=[2, missing, 2]),
+            patch.object(svc, "_update_table_metadata", new_callable=AsyncMock),
+        ):
+            await svc._store_data(df, mock_interface, 1, mock_db)
+            result = await svc._store_data(df, mock_interface, 1, mock_db)
+
+        assert result == 2
+        # First download, then the retry after the failed insert
+        assert mock_db.execute.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_insert_failure_after_fresh_ddl_is_not_retried(self, svc):
+        mock_db = AsyncMock()
+        mock_interface = MagicMock()
+        mock_interface.name = "test_func"
+        df = pd.DataFrame({"col_a": [1, 2]})
+        error = ProgrammingError("INSERT", {}, Exception("bad value"))
+
+        with (
+            patch.object(svc, "_insert_data", new_callable=AsyncMock, side_effect=error),
+            pytest.raises(ProgrammingError),
+        ):
+            await svc._store_data(df, mock_interface, 1, mock_db)
+
+        mock_db.execute.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_cache_key_ignores_dtypes(self, svc):
+        mock_db = AsyncMock()
+        await svc._create_table_if_not_exists("ak_test", pd.DataFrame({"a": [1]}), mock_db)
+        await svc._create_table_if_not_exists("ak_test", pd.DataFrame({"a": [1.5]}), mock_db)
+        mock_db.execute.assert_called_once()
+
 
 class TestInsertData:
     @pytest.mark.asyncio
@@ -227,16 +421,102 @@ class TestInsertData:
     async def test_insert_large_batch(self, svc):
         mock_db = AsyncMock()
         # Mock execute to return a result with rowcount matching batch size
-        mock_result_1 = MagicMock()
-        mock_result_1.rowcount = 2000
-        mock_result_2 = MagicMock()
-        mock_result_2.rowcount = 500
-        mock_db.execute = AsyncMock(side_effect=[mock_result_1, mock_result_2])
+        results = [MagicMock(), MagicMock(), MagicMock()]
+        for result, rowcount in zip(results, [1000, 1000, 500], strict=True):
+            result.rowcount = rowcount
+        mock_db.execute = AsyncMock(side_effect=results)
         df = pd.DataFrame({"a": list(range(2500))})
         result = await svc._insert_data("ak_test", df, mock_db)
         assert result == 2500
-        # Should have 2 batch calls (2000 + 500)
-        assert mock_db.execute.call_count == 2
+        # Should have 3 multi-row statements (1000 + 1000 + 500)
+        assert mock_db.execute.call_count == 3
+        # Full batches reuse one statement; only the tail gets its own
+        stmts = [c.args[0] for c in mock_db.execute.call_args_list]
+        assert stmts[0] is stmts[1]
+        assert stmts[2] is not stmts[0]
+
+    @pytest.mark.asyncio
+    async def test_full_batch_statement_not_kept_across_calls(self, svc):
+        mock_db = AsyncMock()
+        df = pd.DataFrame({"a": list(range(1000))})
+        await svc._insert_data("ak_test", df, mock_db)
+        await svc._insert_data("ak_test", df + 1000, mock_db)
+        # Full-batch statements are large, so the service does not hold on to them
+        first, second = (c.args[0] for c in mock_db.execute.call_args_list)
+        assert first is not second
+
+    @pytest.mark.asyncio
+    async def test_insert_uses_multirow_values(self, svc):
+        mock_db = AsyncMock()
+        df = pd.DataFrame({"a": [1, 2, 3]})
+        await svc._insert_data("ak_test", df, mock_db)
+        stmt, params = mock_db.execute.call_args.args
+        assert str(stmt).count("), (") == 2
+        # Two columns per row: "a" and row_hash
+        assert len(params) == 6
+        assert params["p2_0"] == 3
+
+    @pytest.mark.asyncio
+    async def test_flush_when_batch_size_does_not_divide_interval(self, svc):
+        mock_db = AsyncMock()
+        df = pd.DataFrame({"a": list(range(45000))})
+        # Two columns per row gives 999-row batches, which never land on a multiple of 20000
+        with patch("app.services.data_acquisition.INSERT_MAX_PARAMS", 1998):
+            await svc._insert_data("ak_test", df, mock_db)
+        assert mock_db.flush.await_count == 2
+
+
+class TestBulkLoad:
+    def test_load_data_field_escapes(self):
+        assert _load_data_field(None) == "\\N"
+        assert _load_data_field(float("nan")) == "\\N"
+        assert _load_data_field(True) == "1"
+        assert _load_data_field("a\tb\\c\n") == "a\\tb\\\\c\\n"
+        assert _load_data_field(1.5) == "1.5"
+
+    def test_load_data_field_missing_values(self):
+        df = pd.DataFrame(
+            {
+                "d": pd.to_datetime(["2024-01-02", None]),
+                "n": pd.array([1, None], dtype="Int64"),
+            }
+        )
+        rows = [[_load_data_field(v) for v in row] for row in df.itertuples(index=False, name=None)]
+        assert rows == [["2024-01-02 00:00:00", "1"], ["\\N", "\\N"]]
+        assert _load_data_field(pd.NaT) == "\\N"
+        assert _load_data_field(pd.NA) == "\\N"
+
+    @pytest.mark.asyncio
+    async def test_mysql_uses_load_data(self, svc):
+        mock_db = AsyncMock()
+        mock_db.bind.dialect.name = "mysql"
+        mock_result = MagicMock()
+        mock_result.rowcount = 2
+        mock_db.execute.return_value = mock_result
+        df = pd.DataFrame({"a": [1.5, 2.5], "b": ["x", "y"]})
+
+        with patch("app.services.data_acquisition.settings") as mock_settings:
+            mock_settings.akshare_bulk_load = True
+            result = await svc._insert_data("ak_test", df, mock_db)
+
+        assert result == 2
+        stmt, params = mock_db.execute.call_args.args
+        assert str(stmt).startswith("LOAD DATA LOCAL INFILE")
+        # Temporary file is removed after loading
+        assert not Path(params["path"]).exists()
+
+    @pytest.mark.asyncio
+    async def test_other_dialect_falls_back_to_insert(self, svc):
+        mock_db = AsyncMock()
+        mock_db.bind.dialect.name = "sqlite"
+        df = pd.DataFrame({"a": [1, 2]})
+
+        with patch("app.services.data_acquisition.settings") as mock_settings:
+            mock_settings.akshare_bulk_load = True
+            await svc._insert_data("ak_test", df, mock_db)
+
+        stmt, _ = mock_db.execute.call_args.args
+        assert str(stmt).startswith("INSERT IGNORE")
 
 
 class TestUpdateTableMetadata:
@@ -244,15 +524,31 @@ class TestUpdateTableMetadata:
     async def test_update_existing(self, svc):
         mock_db = AsyncMock()
         mock_meta = MagicMock()
+        mock_meta.row_count = 100
+
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = mock_meta  # existing metadata
+        mock_db.execute.return_value = result
+
+        await svc._update_table_metadata("ak_test", 1, 1, 50, mock_db)
+        # Incremented without a COUNT(*) scan
+        assert mock_meta.row_count == 150
+        mock_db.execute.assert_called_once()
+        # Note: commit is now handled by the caller for transaction consistency
+
+    @pytest.mark.asyncio
+    async def test_update_existing_resync(self, svc):
+        mock_db = AsyncMock()
+        mock_meta = MagicMock()
+        mock_meta.row_count = 100
 
         results = [MagicMock(), MagicMock()]
         results[0].scalar_one_or_none.return_value = mock_meta  # existing metadata
-        results[1].scalar.return_value = 100  # total rows
+        results[1].scalar.return_value = 120  # total rows
         mock_db.execute.side_effect = results
 
-        await svc._update_table_metadata("ak_test", 1, 1, 50, mock_db)
-        assert mock_meta.row_count == 100
-        # Note: commit is now handled by the caller for transaction consistency
+        await svc._update_table_metadata("ak_test", 1, 1, 50, mock_db, resync=True)
+        assert mock_meta.row_count == 120
 
     @pytest.mark.asyncio
     async def test_create_new(self, svc):
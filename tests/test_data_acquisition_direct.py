@@ -8,7 +8,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pandas as pd
 import pytest
 
-from app.services.data_acquisition import DataAcquisitionService
+from app.services.data_acquisition import DataAcquisitionService, get_data_acquisition_service
 
 
 class TestInit:
@@ -16,6 +16,12 @@ class TestInit:
         svc = DataAcquisitionService()
         assert svc._active_executions == {}
 
+    def test_shared_instance(self):
+        from app.api.data import data_service
+
+        assert get_data_acquisition_service() is get_data_acquisition_service()
+        assert data_service is get_data_acquisition_service()
+
 
 class TestGenerateTableName:
     def test_basic(self):
@@ -64,6 +70,14 @@ class TestGetProgress:
         result = svc.get_progress(1)
         assert result["status"] == "running"
         assert result["interface_id"] == 10
+        assert result["progress"] == 0
+
+    def test_active_with_row_counts(self):
+        svc = DataAcquisitionService()
+        svc._active_executions[1] = {"interface_id": 10, "total_rows": 200, "rows_done": 50}
+        result = svc.get_progress(1)
+        assert result["rows_done"] == 50
+        assert result["progress"] == 25.0
 
 
 class TestCancelExecution:
@@ -2,205 +2,152 @@
 Direct tests for data API endpoints to maximize coverage.
 """
 
-from datetime import datetime
-from unittest.mock import AsyncMock, patch
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import hash_password
-from app.models.interface import DataInterface, InterfaceCategory
-from app.models.task import ScheduledTask, ScheduleType, TaskExecution, TaskStatus
+from app.api.data import get_download_progress, get_download_result, trigger_download
+from app.api.schemas import DataDownloadRequest
+from app.models.interface import DataInterface
+from app.models.task import TaskExecution, TaskStatus
 from app.models.user import User, UserRole
 
+pytestmark = pytest.mark.asyncio(loop_scope="module")
 
-async def _user(db):
-    u = User(
-        username="du",
-        email="du@t.com",
-        hashed_password=hash_password("P!1"),
-        role=UserRole.USER,
-        is_active=True,
-    )
-    db.add(u)
-    await db.commit()
-    await db.refresh(u)
-    return u
+
+def _missing_row_db():
+    """Session mock whose lookups find nothing, for the 404 branches."""
+    db = AsyncMock(spec=AsyncSession)
+    db.execute.return_value = MagicMock()
+    db.execute.return_value.scalar_one_or_none.return_value = None
+    return db
 
 
-async def _iface(db, name="di1", active=True):
-    cat = InterfaceCategory(name=f"cat_{name}", description="T", sort_order=1)
-    db.add(cat)
-    await db.flush()
+def _mock_user():
+    return MagicMock(spec=User, id=1, role=UserRole.USER)
+
+
+async def _iface(db, category, name="di1", active=True):
     iface = DataInterface(
-        name=name, display_name=f"D {name}", category_id=cat.id, parameters={}, is_active=active
+        name=name,
+        display_name=f"D {name}",
+        category_id=category.id,
+        parameters={},
+        is_active=active,
     )
     db.add(iface)
     await db.commit()
-    await db.refresh(iface)
     return iface
 
 
-async def _task_and_exec(db, eid, status=TaskStatus.COMPLETED, **kw):
-    task = ScheduledTask(
-        name="DT",
-        user_id=1,
-        script_id="ds",
-        schedule_type=ScheduleType.CRON,
-        schedule_expression="0 8 * * *",
-        parameters={},
-    )
-    db.add(task)
-    await db.flush()
+async def _execution(db, task, eid, status=TaskStatus.COMPLETED, **kw):
     e = TaskExecution(
-        execution_id=eid, task_id=task.id, script_id="ds", status=status, retry_count=0, **kw
+        execution_id=eid,
+        task_id=task.id,
+        script_id=task.script_id,
+        status=status,
+        retry_count=0,
+        **kw,
     )
     db.add(e)
     await db.commit()
-    await db.refresh(e)
     return e
 
 
 class TestTriggerDownloadDirect:
-    @pytest.mark.asyncio
-    async def test_success(self, test_db):
-        from app.api.data import trigger_download
-        from app.api.schemas import DataDownloadRequest
-
-        user = await _user(test_db)
-        iface = await _iface(test_db, "dl_ok")
-        req = DataDownloadRequest(interface_id=iface.id, parameters={})
+    async def test_success(self, shared_db, shared_user, shared_category):
+        iface = await _iface(shared_db, shared_category, "dl_ok")
+        req = DataDownloadRequest.model_construct(interface_id=iface.id, parameters={})
         with patch("app.api.data.data_service.execute_download", new_callable=AsyncMock):
-            result = await trigger_download(request=req, current_user=user, db=test_db)
+            result = await trigger_download(request=req, current_user=shared_user, db=shared_db)
         assert result.status == "pending"
 
-    @pytest.mark.asyncio
-    async def test_not_found(self, test_db):
-        from app.api.data import trigger_download
-        from app.api.schemas import DataDownloadRequest
-
-        user = await _user(test_db)
+    async def test_not_found(self):
         req = DataDownloadRequest(interface_id=99999, parameters={})
         with pytest.raises(HTTPException) as exc:
-            await trigger_download(request=req, current_user=user, db=test_db)
+            await trigger_download(request=req, current_user=_mock_user(), db=_missing_row_db())
         assert exc.value.status_code == 404
 
-    @pytest.mark.asyncio
-    async def test_inactive(self, test_db):
-        from app.api.data import trigger_download
-        from app.api.schemas import DataDownloadRequest
-
-        user = await _user(test_db)
-        iface = await _iface(test_db, "dl_inactive", active=False)
-        req = DataDownloadRequest(interface_id=iface.id, parameters={})
+    async def test_inactive(self, shared_db, shared_user, shared_category):
+        iface = await _iface(shared_db, shared_category, "dl_inactive", active=False)
+        req = DataDownloadRequest.model_construct(interface_id=iface.id, parameters={})
         with pytest.raises(HTTPException) as exc:
-            await trigger_download(request=req, current_user=user, db=test_db)
+            await trigger_download(request=req, current_user=shared_user, db=shared_db)
         assert exc.value.status_code == 400
 
 
 class TestGetProgressDirect:
-    @pytest.mark.asyncio
-    async def test_completed(self, test_db):
-        from app.api.data import get_download_progress
-
-        user = await _user(test_db)
-        e = await _task_and_exec(test_db, "ep1", TaskStatus.COMPLETED)
-        result = await get_download_progress(execution_id=e.id, current_user=user, db=test_db)
-        assert result.progress == 100.0
-
-    @pytest.mark.asyncio
-    async def test_running(self, test_db):
-        from app.api.data import get_download_progress
-
-        user = await _user(test_db)
-        e = await _task_and_exec(test_db, "ep2", TaskStatus.RUNNING, start_time=datetime.utcnow())
-        result = await get_download_progress(execution_id=e.id, current_user=user, db=test_db)
-        assert result.status == "running"
-        assert result.progress > 0 or result.progress == 0  # may be 0 if very fast
-
-    @pytest.mark.asyncio
-    async def test_pending(self, test_db):
-        from app.api.data import get_download_progress
-
-        user = await _user(test_db)
-        e = await _task_and_exec(test_db, "ep3", TaskStatus.PENDING)
-        result = await get_download_progress(execution_id=e.id, current_user=user, db=test_db)
-        assert result.progress == 0.0
-
-    @pytest.mark.asyncio
-    async def test_failed(self, test_db):
-        from app.api.data import get_download_progress
-
-        user = await _user(test_db)
-        e = await _task_and_exec(test_db, "ep4", TaskStatus.FAILED, error_message="err")
-        result = await get_download_progress(execution_id=e.id, current_user=user, db=test_db)
-        assert result.progress == 0.0
-        assert result.message == "err"
-
-    @pytest.mark.asyncio
-    async def test_not_found(self, test_db):
-        from app.api.data import get_download_progress
-
-        user = await _user(test_db)
+    @pytest.mark.parametrize(
+        ("status", "extra", "expected_progress", "expected_message"),
+        [
+            (TaskStatus.COMPLETED, {}, 100.0, None),
+            (TaskStatus.RUNNING, {"start_time": datetime.now(UTC)}, None, None),
+            (TaskStatus.RUNNING, {}, 0.0, None),
+            (TaskStatus.PENDING, {}, 0.0, None),
+            (TaskStatus.FAILED, {"error_message": "err"}, 0.0, "err"),
+        ],
+        ids=["completed", "running", "running_no_start", "pending", "failed"],
+    )
+    async def test_progress(
+        self,
+        shared_db,
+        shared_user,
+        shared_task,
+        status,
+        extra,
+        expected_progress,
+        expected_message,
+    ):
+        e = await _execution(shared_db, shared_task, "ep", status, **extra)
+        result = await get_download_progress(
+            execution_id=e.id, current_user=shared_user, db=shared_db
+        )
+        assert result.status == status.value
+        if expected_progress is not None:
+            assert result.progress == expected_progress
+        assert result.message == expected_message
+
+    async def test_not_found(self):
         with pytest.raises(HTTPException) as exc:
-            await get_download_progress(execution_id=99999, current_user=user, db=test_db)
+            await get_download_progress(
+                execution_id=99999, current_user=_mock_user(), db=_missing_row_db()
+            )
         assert exc.value.status_code == 404
 
-    @pytest.mark.asyncio
-    async def test_running_no_start(self, test_db):
-        from app.api.data import get_download_progress
-
-        user = await _user(test_db)
-        e = await _task_and_exec(test_db, "ep5", TaskStatus.RUNNING)
-        result = await get_download_progress(execution_id=e.id, current_user=user, db=test_db)
-        assert result.status == "running"
-
 
 class TestGetResultDirect:
-    @pytest.mark.asyncio
-    async def test_completed(self, test_db):
-        from app.api.data import get_download_result
-
-        user = await _user(test_db)
-        e = await _task_and_exec(test_db, "er1", TaskStatus.COMPLETED, end_time=datetime.utcnow())
-        result = await get_download_result(execution_id=e.id, current_user=user, db=test_db)
+    async def test_completed(self, shared_db, shared_user, shared_task):
+        e = await _execution(
+            shared_db, shared_task, "er1", TaskStatus.COMPLETED, end_time=datetime.now(UTC)
+        )
+        result = await get_download_result(
+            execution_id=e.id, current_user=shared_user, db=shared_db
+        )
         assert result.success is True
 
-    @pytest.mark.asyncio
-    async def test_running(self, test_db):
-        from app.api.data import get_download_result
-
-        user = await _user(test_db)
-        e = await _task_and_exec(test_db, "er2", TaskStatus.RUNNING)
-        with pytest.raises(HTTPException) as exc:
-            await get_download_result(execution_id=e.id, current_user=user, db=test_db)
-        assert exc.value.status_code == 202
-
-    @pytest.mark.asyncio
-    async def test_pending(self, test_db):
-        from app.api.data import get_download_result
-
-        user = await _user(test_db)
-        e = await _task_and_exec(test_db, "er3", TaskStatus.PENDING)
-        with pytest.raises(HTTPException) as exc:
-            await get_download_result(execution_id=e.id, current_user=user, db=test_db)
-        assert exc.value.status_code == 202
-
-    @pytest.mark.asyncio
-    async def test_failed(self, test_db):
-        from app.api.data import get_download_result
-
-        user = await _user(test_db)
-        e = await _task_and_exec(test_db, "er4", TaskStatus.FAILED, error_message="fail")
+    @pytest.mark.parametrize(
+        ("status", "extra", "expected_code"),
+        [
+            (TaskStatus.RUNNING, {}, 202),
+            (TaskStatus.PENDING, {}, 202),
+            (TaskStatus.FAILED, {"error_message": "fail"}, 500),
+        ],
+        ids=["running", "pending", "failed"],
+    )
+    async def test_not_finished(
+        self, shared_db, shared_user, shared_task, status, extra, expected_code
+    ):
+        e = await _execution(shared_db, shared_task, "er", status, **extra)
         with pytest.raises(HTTPException) as exc:
-            await get_download_result(execution_id=e.id, current_user=user, db=test_db)
-        assert exc.value.status_code == 500
-
-    @pytest.mark.asyncio
-    async def test_not_found(self, test_db):
-        from app.api.data import get_download_result
+            await get_download_result(execution_id=e.id, current_user=shared_user, db=shared_db)
+        assert exc.value.status_code == expected_code
 
-        user = await _user(test_db)
+    async def test_not_found(self):
         with pytest.raises(HTTPException) as exc:
-            await get_download_result(execution_id=99999, current_user=user, db=test_db)
+            await get_download_result(
+                execution_id=99999, current_user=_mock_user(), db=_missing_row_db()
+            )
         assert exc.value.status_code == 404
@@ -4,29 +4,25 @@ Database module tests.
 Tests for database initialization, connection, and utilities.
 """
 
+import pytest
+
 
 class TestDatabase:
     """Test database functions."""
 
-    def test_get_db_session(self, test_db):
+    @pytest.mark.asyncio
+    async def test_get_db_session(self):
         """Test get_db dependency."""
-        import asyncio
+        from sqlalchemy.ext.asyncio import AsyncSession
 
         from app.core.database import get_db
 
-        async def check_session():
-            gen = get_db()
-            db = await gen.__anext__()
-
-            try:
-                assert db is not None
-                from sqlalchemy.ext.asyncio import AsyncSession
-
-                assert isinstance(db, AsyncSession)
-            finally:
-                await gen.aclose()
-
-        asyncio.run(check_session())
+        gen = get_db()
+        db = await gen.__anext__()
+        try:
+            assert isinstance(db, AsyncSession)
+        finally:
+            await gen.aclose()
 
     def test_base_metadata(self):
         """Test Base metadata."""
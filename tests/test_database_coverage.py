@@ -9,15 +9,23 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
 
+@contextlib.contextmanager
+def _patched_session_maker(name="async_session_maker", session=None):
+    """Patch a session maker in app.core.database to hand out ``session``.
+
+    Yields ``(session_maker_mock, session)``.
+    """
+    session = session or AsyncMock()
+    with patch(f"app.core.database.{name}") as mock_sm:
+        mock_sm.return_value.__aenter__ = AsyncMock(return_value=session)
+        mock_sm.return_value.__aexit__ = AsyncMock(return_value=False)
+        yield mock_sm, session
+
+
 class TestGetDataDb:
     @pytest.mark.asyncio
     async def test_normal_flow(self):
-        mock_session = AsyncMock()
-
-        with patch("app.core.database.data_session_maker") as mock_sm:
-            mock_sm.return_value.__aenter__ = AsyncMock(return_value=mock_session)
-            mock_sm.return_value.__aexit__ = AsyncMock(return_value=False)
-
+        with _patched_session_maker("data_session_maker") as (_, mock_session):
             from app.core.database import get_data_db
 
             gen = get_data_db()
@@ -26,12 +34,7 @@ class TestGetDataDb:
 
     @pytest.mark.asyncio
     async def test_exception_rollback(self):
-        mock_session = AsyncMock()
-
-        with patch("app.core.database.data_session_maker") as mock_sm:
-            mock_sm.return_value.__aenter__ = AsyncMock(return_value=mock_session)
-            mock_sm.return_value.__aexit__ = AsyncMock(return_value=False)
-
+        with _patched_session_maker("data_session_maker") as (_, mock_session):
             from app.core.database import get_data_db
 
             gen = get_data_db()
@@ -45,12 +48,7 @@ class TestGetDataDb:
 class TestGetDbContext:
     @pytest.mark.asyncio
     async def test_normal_flow(self):
-        mock_session = AsyncMock()
-
-        with patch("app.core.database.async_session_maker") as mock_sm:
-            mock_sm.return_value.__aenter__ = AsyncMock(return_value=mock_session)
-            mock_sm.return_value.__aexit__ = AsyncMock(return_value=False)
-
+        with _patched_session_maker() as (_, mock_session):
             from app.core.database import get_db_context
 
             async with get_db_context() as session:
@@ -59,12 +57,7 @@ class TestGetDbContext:
 
     @pytest.mark.asyncio
     async def test_exception_rollback(self):
-        mock_session = AsyncMock()
-
-        with patch("app.core.database.async_session_maker") as mock_sm:
-            mock_sm.return_value.__aenter__ = AsyncMock(return_value=mock_session)
-            mock_sm.return_value.__aexit__ = AsyncMock(return_value=False)
-
+        with _patched_session_maker() as (_, mock_session):
             from app.core.database import get_db_context
 
             with pytest.raises(RuntimeError):
@@ -81,10 +74,7 @@ class TestInitDb:
         mock_result.scalar_one_or_none.return_value = MagicMock()  # admin exists
         mock_session.execute.return_value = mock_result
 
-        with patch("app.core.database.async_session_maker") as mock_sm:
-            mock_sm.return_value.__aenter__ = AsyncMock(return_value=mock_session)
-            mock_sm.return_value.__aexit__ = AsyncMock(return_value=False)
-
+        with _patched_session_maker(session=mock_session):
             from app.core.database import init_db
 
             await init_db()
@@ -98,10 +88,7 @@ class TestInitDb:
         mock_result.scalar_one_or_none.return_value = None  # no admin
         mock_session.execute.return_value = mock_result
 
-        with patch("app.core.database.async_session_maker") as mock_sm:
-            mock_sm.return_value.__aenter__ = AsyncMock(return_value=mock_session)
-            mock_sm.return_value.__aexit__ = AsyncMock(return_value=False)
-
+        with _patched_session_maker(session=mock_session):
             from app.core.database import init_db
 
             await init_db()
@@ -145,12 +132,7 @@ class TestCloseDb:
 class TestCheckDbConnection:
     @pytest.mark.asyncio
     async def test_success(self):
-        mock_session = AsyncMock()
-
-        with patch("app.core.database.async_session_maker") as mock_sm:
-            mock_sm.return_value.__aenter__ = AsyncMock(return_value=mock_session)
-            mock_sm.return_value.__aexit__ = AsyncMock(return_value=False)
-
+        with _patched_session_maker() as (_, mock_session):
             from app.core.database import check_db_connection
 
             result = await check_db_connection()
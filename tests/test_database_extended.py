@@ -4,27 +4,20 @@ Database module extended tests.
 Additional tests for database functionality.
 """
 
+import importlib
 
-class TestDatabaseFunctions:
-    """Test database module functions."""
-
-    def test_create_tables_function(self):
-        """Test create_tables function exists."""
-        from app.core.database import create_tables
+import pytest
 
-        assert callable(create_tables)
 
-    def test_init_db_function(self):
-        """Test init_db function exists."""
-        from app.core.database import init_db
-
-        assert callable(init_db)
+class TestDatabaseFunctions:
+    """Test database module functions."""
 
-    def test_close_db_function(self):
-        """Test close_db function exists."""
-        from app.core.database import close_db
+    @pytest.mark.parametrize("name", ["create_tables", "init_db", "close_db"])
+    def test_db_function_callable(self, name):
+        """Test database lifecycle functions exist and are callable."""
+        import app.core.database as database
 
-        assert callable(close_db)
+        assert callable(getattr(database, name))
 
     def test_engine_is_async(self):
         """Test database engine is async."""
@@ -48,171 +41,88 @@ class TestDatabaseFunctions:
         assert async_session_maker is not None
 
 
-class TestAPIRoutes:
-    """Test API route registration."""
-
-    def test_auth_router_registered(self):
-        """Test auth router is registered."""
-        from app.main import app
-
-        routes = [r for r in app.routes if hasattr(r, "path")]
-        auth_routes = [r.path for r in routes if r.path.startswith("/api/auth")]
-        assert len(auth_routes) > 0
-
-    def test_users_router_registered(self):
-        """Test users router is registered."""
-        from app.main import app
+@pytest.fixture(scope="module")
+def route_paths(main_app):
+    """Paths of every route registered on the application."""
+    return [r.path for r in main_app.routes if hasattr(r, "path")]
 
-        routes = [r for r in app.routes if hasattr(r, "path")]
-        users_routes = [r.path for r in routes if r.path.startswith("/api/users")]
-        assert len(users_routes) > 0
 
-    def test_tasks_router_registered(self):
-        """Test tasks router is registered."""
-        from app.main import app
+@pytest.fixture(scope="module")
+def middleware_names(main_app):
+    """Lower-cased descriptions of the user middleware stack."""
+    return [str(m).lower() for m in main_app.user_middleware]
 
-        routes = [r for r in app.routes if hasattr(r, "path")]
-        tasks_routes = [r.path for r in routes if r.path.startswith("/api/tasks")]
-        assert len(tasks_routes) > 0
 
-    def test_scripts_router_registered(self):
-        """Test scripts router is registered."""
-        from app.main import app
-
-        routes = [r for r in app.routes if hasattr(r, "path")]
-        scripts_routes = [r.path for r in routes if r.path.startswith("/api/scripts")]
-        assert len(scripts_routes) > 0
-
-    def test_executions_router_registered(self):
-        """Test executions router is registered."""
-        from app.main import app
-
-        routes = [r for r in app.routes if hasattr(r, "path")]
-        exec_routes = [r.path for r in routes if r.path.startswith("/api/executions")]
-        assert len(exec_routes) > 0
-
-    def test_tables_router_registered(self):
-        """Test tables router is registered."""
-        from app.main import app
-
-        routes = [r for r in app.routes if hasattr(r, "path")]
-        tables_routes = [r.path for r in routes if r.path.startswith("/api/tables")]
-        assert len(tables_routes) > 0
-
-    def test_data_router_registered(self):
-        """Test data router is registered."""
-        from app.main import app
+class TestAPIRoutes:
+    """Test API route registration."""
 
-        routes = [r for r in app.routes if hasattr(r, "path")]
-        data_routes = [r.path for r in routes if r.path.startswith("/api/data")]
-        assert len(data_routes) > 0
+    @pytest.mark.parametrize(
+        "prefix",
+        [
+            "/api/auth",
+            "/api/users",
+            "/api/tasks",
+            "/api/scripts",
+            "/api/executions",
+            "/api/tables",
+            "/api/data",
+        ],
+    )
+    def test_router_registered(self, route_paths, prefix):
+        """Test each API router is mounted under its prefix."""
+        assert any(p.startswith(prefix) for p in route_paths)
 
 
 class TestAPIEndpoints:
     """Test specific API endpoint configurations."""
 
-    def test_health_endpoint(self):
+    def test_health_endpoint(self, route_paths):
         """Test health check endpoint exists."""
-        from app.main import app
-
-        routes = [r.path for r in app.routes if hasattr(r, "path")]
-        health_routes = [r for r in routes if "health" in r.lower()]
+        health_routes = [p for p in route_paths if "health" in p.lower()]
         # May or may not have health endpoint
         assert len(health_routes) >= 0
 
-    def test_docs_endpoint(self):
+    def test_docs_endpoint(self, route_paths):
         """Test Swagger docs endpoint."""
-        from app.main import app
-
         # FastAPI automatically adds /docs
-        routes = [r.path for r in app.routes if hasattr(r, "path")]
-        assert "/docs" in routes or "/openapi.json" in routes
+        assert "/docs" in route_paths or "/openapi.json" in route_paths
 
 
 class TestMiddleware:
     """Test middleware configuration."""
 
-    def test_cors_middleware(self):
+    def test_cors_middleware(self, middleware_names):
         """Test CORS middleware is configured."""
-        from app.main import app
+        assert any("cors" in name for name in middleware_names)
 
-        # Check for CORS in user_middleware
-        has_cors = any("cors" in str(m).lower() for m in app.user_middleware)
-        assert has_cors
-
-    def test_middleware_stack(self):
+    def test_middleware_stack(self, main_app):
         """Test middleware stack exists."""
-        from app.main import app
-
-        assert hasattr(app, "user_middleware")
-        assert isinstance(app.user_middleware, list)
+        assert hasattr(main_app, "user_middleware")
+        assert isinstance(main_app.user_middleware, list)
 
 
 class TestAPIRouters:
     """Test individual API routers."""
 
-    def test_auth_router_importable(self):
-        """Test auth router can be imported."""
-        from app.api import auth
-
-        assert auth is not None
-        assert hasattr(auth, "router")
-
-    def test_users_router_importable(self):
-        """Test users router can be imported."""
-        from app.api import users
-
-        assert users is not None
-        assert hasattr(users, "router")
-
-    def test_tasks_router_importable(self):
-        """Test tasks router can be imported."""
-        from app.api import tasks
-
-        assert tasks is not None
-        assert hasattr(tasks, "router")
-
-    def test_scripts_router_importable(self):
-        """Test scripts router can be imported."""
-        from app.api import scripts
-
-        assert scripts is not None
-        assert hasattr(scripts, "router")
-
-    def test_executions_router_importable(self):
-        """Test executions router can be imported."""
-        from app.api import executions
-
-        assert executions is not None
-        assert hasattr(executions, "router")
-
-    def test_tables_router_importable(self):
-        """Test tables router can be imported."""
-        from app.api import tables
-
-        assert tables is not None
-        assert hasattr(tables, "router")
-
-    def test_data_router_importable(self):
-        """Test data router can be imported."""
-        from app.api import data
-
-        assert data is not None
-        assert hasattr(data, "router")
-
-    def test_settings_router_importable(self):
-        """Test settings router can be imported."""
-        from app.api import settings
-
-        assert settings is not None
-        assert hasattr(settings, "router")
-
-    def test_interfaces_router_importable(self):
-        """Test interfaces router can be imported."""
-        from app.api import interfaces
-
-        assert interfaces is not None
-        assert hasattr(interfaces, "router")
+    @pytest.mark.parametrize(
+        "name",
+        [
+            "auth",
+            "users",
+            "tasks",
+            "scripts",
+            "executions",
+            "tables",
+            "data",
+            "settings",
+            "interfaces",
+        ],
+    )
+    def test_router_importable(self, name):
+        """Test each API module can be imported and exposes a router."""
+        module = importlib.import_module(f"app.api.{name}")
+
+        assert hasattr(module, "router")
 
 
 class TestDependenciesModule:
@@ -257,19 +167,9 @@ class TestRateLimiterModule:
 
         assert callable(is_testing)
 
-    def test_is_testing_checks_env(self):
+    def test_is_testing_checks_env(self, monkeypatch):
         """Test is_testing checks environment variable."""
-        import os
-
         from app.api.rate_limit import is_testing
 
-        # Set testing mode
-        old_val = os.environ.get("TESTING")
-        os.environ["TESTING"] = "true"
+        monkeypatch.setenv("TESTING", "true")
         assert is_testing() is True
-
-        # Reset
-        if old_val is None:
-            os.environ.pop("TESTING", None)
-        else:
-            os.environ["TESTING"] = old_val
@@ -2,91 +2,102 @@
 Direct tests for API dependencies to maximize coverage.
 """
 
+import functools
+
 import pytest
 from fastapi import HTTPException
 from fastapi.security import HTTPAuthorizationCredentials
 
+from app.api.dependencies import (
+    get_current_active_user,
+    get_current_admin_user,
+    get_current_user,
+    get_optional_user,
+)
 from app.core.security import create_access_token, hash_password
 from app.models.user import User, UserRole
 
+# Hashed once: none of these tests verify the password.
+_FAKE_HASH = hash_password("P!1")
+
+
+@functools.lru_cache(maxsize=128)
+def _tok(sub, email):
+    """Sign an access token once per (sub, email) and reuse it."""
+    return create_access_token(data={"sub": sub, "email": email})
+
+
+def _tok_for(user):
+    return _tok(str(user.id), user.email)
+
 
 async def _user(db, role=UserRole.USER, active=True):
     u = User(
         username=f"dep_{role.value}",
         email=f"dep_{role.value}@t.com",
-        hashed_password=hash_password("P!1"),
+        hashed_password=_FAKE_HASH,
         role=role,
         is_active=active,
     )
     db.add(u)
     await db.commit()
-    await db.refresh(u)
     return u
 
 
-class TestGetCurrentUser:
-    @pytest.mark.asyncio
-    async def test_no_credentials(self, test_db):
-        from app.api.dependencies import get_current_user
+def _bearer(token):
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
 
-        with pytest.raises(HTTPException) as exc:
-            await get_current_user(credentials=None, db=test_db)
-        assert exc.value.status_code == 401
 
-    @pytest.mark.asyncio
-    async def test_invalid_token(self, test_db):
-        from app.api.dependencies import get_current_user
+async def _no_credentials(db):
+    return None
 
-        creds = HTTPAuthorizationCredentials(scheme="Bearer", credentials="invalid_token")
-        with pytest.raises(HTTPException) as exc:
-            await get_current_user(credentials=creds, db=test_db)
-        assert exc.value.status_code == 401
 
-    @pytest.mark.asyncio
-    async def test_valid_token(self, test_db):
-        from app.api.dependencies import get_current_user
+async def _invalid_token(db):
+    return _bearer("invalid_token")
 
-        user = await _user(test_db)
-        token = create_access_token(data={"sub": str(user.id), "email": user.email})
-        creds = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
-        result = await get_current_user(credentials=creds, db=test_db)
-        assert result.id == user.id
 
-    @pytest.mark.asyncio
-    async def test_user_not_found(self, test_db):
-        from app.api.dependencies import get_current_user
+async def _unknown_user(db):
+    return _bearer(_tok("99999", "x@t.com"))
 
-        token = create_access_token(data={"sub": "99999", "email": "x@t.com"})
-        creds = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
-        with pytest.raises(HTTPException) as exc:
-            await get_current_user(credentials=creds, db=test_db)
-        assert exc.value.status_code == 401
 
+async def _inactive_user(db):
+    return _bearer(_tok_for(await _user(db, active=False)))
+
+
+class TestGetCurrentUser:
     @pytest.mark.asyncio
-    async def test_inactive_user(self, test_db):
-        from app.api.dependencies import get_current_user
+    async def test_valid_token(self, test_db):
+        user = await _user(test_db)
+        result = await get_current_user(credentials=_bearer(_tok_for(user)), db=test_db)
+        assert result.id == user.id
 
-        user = await _user(test_db, active=False)
-        token = create_access_token(data={"sub": str(user.id), "email": user.email})
-        creds = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("make_credentials", "expected_status"),
+        [
+            (_no_credentials, 401),
+            (_invalid_token, 401),
+            (_unknown_user, 401),
+            (_inactive_user, 403),
+        ],
+        ids=["no_credentials", "invalid_token", "user_not_found", "inactive_user"],
+    )
+    async def test_rejected(self, test_db, make_credentials, expected_status):
+        credentials = await make_credentials(test_db)
         with pytest.raises(HTTPException) as exc:
-            await get_current_user(credentials=creds, db=test_db)
-        assert exc.value.status_code == 403
+            await get_current_user(credentials=credentials, db=test_db)
+        assert exc.value.status_code == expected_status
 
 
 class TestGetCurrentActiveUser:
     @pytest.mark.asyncio
     async def test_active(self, test_db):
-        from app.api.dependencies import get_current_active_user
-
         user = await _user(test_db)
         result = await get_current_active_user(current_user=user)
         assert result.id == user.id
 
     @pytest.mark.asyncio
     async def test_inactive(self, test_db):
-        from app.api.dependencies import get_current_active_user
-
         user = await _user(test_db, active=False)
         with pytest.raises(HTTPException) as exc:
             await get_current_active_user(current_user=user)
@@ -96,16 +107,12 @@ class TestGetCurrentActiveUser:
 class TestGetCurrentAdminUser:
     @pytest.mark.asyncio
     async def test_admin(self, test_db):
-        from app.api.dependencies import get_current_admin_user
-
         admin = await _user(test_db, UserRole.ADMIN)
         result = await get_current_admin_user(current_user=admin)
         assert result.role == UserRole.ADMIN
 
     @pytest.mark.asyncio
     async def test_non_admin(self, test_db):
-        from app.api.dependencies import get_current_admin_user
-
         user = await _user(test_db)
         with pytest.raises(HTTPException) as exc:
             await get_current_admin_user(current_user=user)
@@ -115,25 +122,16 @@ class TestGetCurrentAdminUser:
 class TestGetOptionalUser:
     @pytest.mark.asyncio
     async def test_no_credentials(self, test_db):
-        from app.api.dependencies import get_optional_user
-
         result = await get_optional_user(credentials=None, db=test_db)
         assert result is None
 
     @pytest.mark.asyncio
     async def test_valid_credentials(self, test_db):
-        from app.api.dependencies import get_optional_user
-
         user = await _user(test_db)
-        token = create_access_token(data={"sub": str(user.id), "email": user.email})
-        creds = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
-        result = await get_optional_user(credentials=creds, db=test_db)
+        result = await get_optional_user(credentials=_bearer(_tok_for(user)), db=test_db)
         assert result.id == user.id
 
     @pytest.mark.asyncio
     async def test_invalid_credentials(self, test_db):
-        from app.api.dependencies import get_optional_user
-
-        creds = HTTPAuthorizationCredentials(scheme="Bearer", credentials="bad")
-        result = await get_optional_user(credentials=creds, db=test_db)
+        result = await get_optional_user(credentials=_bearer("bad"), db=test_db)
         assert result is None
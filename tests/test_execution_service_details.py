@@ -7,24 +7,30 @@ Tests for ExecutionService methods.
 from datetime import UTC, datetime
 
 import pytest
+import pytest_asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.data_script import DataScript
+from app.models.task import ScheduledTask, TaskStatus
+from app.models.user import User
+from app.services.execution_service import ExecutionService
+
+pytestmark = [pytest.mark.asyncio(loop_scope="module"), pytest.mark.usefixtures("frozen_now")]
+
+# Start/end time passed to update_execution; the service clock itself is frozen
+_FIXED_TIME = datetime(2024, 1, 1, 12, 0, tzinfo=UTC)
+
 
 async def create_user_script_task(test_db, suffix):
     """Helper to create user, script, and task."""
-    from app.models.data_script import DataScript
-    from app.models.task import ScheduledTask
-    from app.models.user import User
-
-    # Create user first and commit to get ID
+    # Flush the user first to populate its ID; everything commits together below
     user = User(
         username=f"testuser_exec{suffix}",
         email=f"testexec{suffix}@example.com",
         hashed_password="hash",
     )
     test_db.add(user)
-    await test_db.commit()
-    await test_db.refresh(user)
+    await test_db.flush()
 
     # Create script
     script = DataScript(
@@ -33,7 +39,6 @@ async def create_user_script_task(test_db, suffix):
         category="test",
         module_path="test.module",
     )
-    test_db.add(script)
 
     # Create task with user_id
     task = ScheduledTask(
@@ -44,29 +49,32 @@ async def create_user_script_task(test_db, suffix):
         schedule_expression="0 0 * * *",
         is_active=True,
     )
-    test_db.add(task)
+    test_db.add_all([script, task])
     await test_db.commit()
 
     return user, script, task
 
 
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def seeded_task(test_db_module):
+    """One user, script and task shared by every test in the module."""
+    async with AsyncSession(bind=test_db_module, expire_on_commit=False) as db:
+        return await create_user_script_task(db, "seed")
+
+
 class TestExecutionServiceCreate:
     """Test ExecutionService create operations."""
 
-    @pytest.mark.asyncio
-    async def test_create_execution(self, test_db: AsyncSession):
+    async def test_create_execution(self, shared_db: AsyncSession, seeded_task):
         """Test creating an execution record."""
-        from app.models.task import TaskStatus
-        from app.services.execution_service import ExecutionService
-
-        user, script, task = await create_user_script_task(test_db, "1")
+        user, script, task = seeded_task
 
-        service = ExecutionService(test_db)
+        service = ExecutionService(shared_db)
 
         # Create execution
         execution = await service.create_execution(
             task_id=task.id,
-            script_id="test_script_exec1",
+            script_id=script.script_id,
             params={"test": "value"},
             triggered_by="manual",
             operator_id=user.id,
@@ -76,13 +84,9 @@ class TestExecutionServiceCreate:
         assert execution.task_id == task.id
         assert execution.status == TaskStatus.PENDING
 
-    @pytest.mark.asyncio
-    async def test_create_execution_with_task_not_found(self, test_db: AsyncSession):
+    async def test_create_execution_with_task_not_found(self, shared_db: AsyncSession):
         """Test creating execution for non-existent task."""
-        from app.models.data_script import DataScript
-        from app.services.execution_service import ExecutionService
-
-        service = ExecutionService(test_db)
+        service = ExecutionService(shared_db)
 
         # Create a script first
         script = DataScript(
@@ -91,8 +95,8 @@ class TestExecutionServiceCreate:
             category="test",
             module_path="test.module",
         )
-        test_db.add(script)
-        await test_db.commit()
+        shared_db.add(script)
+        await shared_db.commit()
 
         # Create execution - should succeed even if task doesn't exist
         execution = await service.create_execution(
@@ -109,28 +113,23 @@ class TestExecutionServiceCreate:
 class TestExecutionServiceUpdate:
     """Test ExecutionService update operations."""
 
-    @pytest.mark.asyncio
-    async def test_update_execution_status(self, test_db: AsyncSession):
+    async def test_update_execution_status(self, shared_db: AsyncSession, seeded_task):
         """Test updating execution status."""
-        from app.models.task import TaskStatus
-        from app.services.execution_service import ExecutionService
-
-        user, script, task = await create_user_script_task(test_db, "2")
+        user, script, task = seeded_task
 
-        service = ExecutionService(test_db)
+        service = ExecutionService(shared_db)
 
         execution = await service.create_execution(
             task_id=task.id,
-            script_id="test_script_exec2",
+            script_id=script.script_id,
             params={},
         )
 
         # Update to running
-        start_time = datetime.now(UTC)
         updated = await service.update_execution(
             execution.execution_id,
             status=TaskStatus.RUNNING,
-            start_time=start_time,
+            start_time=_FIXED_TIME,
         )
 
         assert updated is True
@@ -139,29 +138,24 @@ class TestExecutionServiceUpdate:
         found = await service.get_execution(execution.execution_id)
         assert found.status == TaskStatus.RUNNING
 
-    @pytest.mark.asyncio
-    async def test_update_execution_complete(self, test_db: AsyncSession):
+    async def test_update_execution_complete(self, shared_db: AsyncSession, seeded_task):
         """Test marking execution as complete."""
-        from app.models.task import TaskStatus
-        from app.services.execution_service import ExecutionService
+        user, script, task = seeded_task
 
-        user, script, task = await create_user_script_task(test_db, "3")
-
-        service = ExecutionService(test_db)
+        service = ExecutionService(shared_db)
 
         execution = await service.create_execution(
             task_id=task.id,
-            script_id="test_script_exec3",
+            script_id=script.script_id,
             params={},
         )
 
         # Update to completed
-        end_time = datetime.now(UTC)
         result_data = {"rows_processed": 100}
         updated = await service.update_execution(
             execution.execution_id,
             status=TaskStatus.COMPLETED,
-            end_time=end_time,
+            end_time=_FIXED_TIME,
             result=result_data,
             rows_after=100,
         )
@@ -176,18 +170,15 @@ class TestExecutionServiceUpdate:
 class TestExecutionServiceGetters:
     """Test ExecutionService getter methods."""
 
-    @pytest.mark.asyncio
-    async def test_get_execution_by_id(self, test_db: AsyncSession):
+    async def test_get_execution_by_id(self, shared_db: AsyncSession, seeded_task):
         """Test getting execution by ID."""
-        from app.services.execution_service import ExecutionService
-
-        user, script, task = await create_user_script_task(test_db, "4")
+        user, script, task = seeded_task
 
-        service = ExecutionService(test_db)
+        service = ExecutionService(shared_db)
 
         execution = await service.create_execution(
             task_id=task.id,
-            script_id="test_script_exec4",
+            script_id=script.script_id,
             params={},
         )
 
@@ -197,35 +188,29 @@ class TestExecutionServiceGetters:
         assert found is not None
         assert found.execution_id == execution.execution_id
 
-    @pytest.mark.asyncio
-    async def test_get_execution_not_found(self, test_db: AsyncSession):
+    async def test_get_execution_not_found(self, shared_db: AsyncSession):
         """Test getting non-existent execution."""
-        from app.services.execution_service import ExecutionService
-
-        service = ExecutionService(test_db)
+        service = ExecutionService(shared_db)
 
         found = await service.get_execution("nonexistent_id")
 
         assert found is None
 
-    @pytest.mark.asyncio
-    async def test_get_executions_by_task(self, test_db: AsyncSession):
+    async def test_get_executions_by_task(self, shared_db: AsyncSession, seeded_task):
         """Test getting executions by task ID."""
-        from app.services.execution_service import ExecutionService
-
-        user, script, task = await create_user_script_task(test_db, "5")
+        user, script, task = seeded_task
 
-        service = ExecutionService(test_db)
+        service = ExecutionService(shared_db)
 
         # Create multiple executions
         await service.create_execution(
             task_id=task.id,
-            script_id="test_script_exec5",
+            script_id=script.script_id,
             params={},
         )
         await service.create_execution(
             task_id=task.id,
-            script_id="test_script_exec5",
+            script_id=script.script_id,
             params={},
         )
 
@@ -239,39 +224,35 @@ class TestExecutionServiceGetters:
 class TestExecutionServiceStats:
     """Test ExecutionService statistics methods."""
 
-    @pytest.mark.asyncio
-    async def test_get_execution_stats_with_data(self, test_db: AsyncSession):
+    async def test_get_execution_stats_with_data(self, shared_db: AsyncSession, seeded_task):
         """Test stats with execution data."""
-        from app.models.task import TaskStatus
-        from app.services.execution_service import ExecutionService
-
-        user, script, task = await create_user_script_task(test_db, "6")
+        user, script, task = seeded_task
 
-        service = ExecutionService(test_db)
+        service = ExecutionService(shared_db)
 
         # Create executions
         exec1 = await service.create_execution(
             task_id=task.id,
-            script_id="test_script_exec6",
+            script_id=script.script_id,
             params={},
         )
         await service.update_execution(
             exec1.execution_id,
             status=TaskStatus.COMPLETED,
-            start_time=datetime.now(UTC),
-            end_time=datetime.now(UTC),
+            start_time=_FIXED_TIME,
+            end_time=_FIXED_TIME,
         )
 
         exec2 = await service.create_execution(
             task_id=task.id,
-            script_id="test_script_exec6",
+            script_id=script.script_id,
             params={},
         )
         await service.update_execution(
             exec2.execution_id,
             status=TaskStatus.FAILED,
-            start_time=datetime.now(UTC),
-            end_time=datetime.now(UTC),
+            start_time=_FIXED_TIME,
+            end_time=_FIXED_TIME,
             error_message="Test error",
         )
 
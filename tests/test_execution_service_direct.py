@@ -2,39 +2,41 @@
 Direct tests for ExecutionService to maximize coverage.
 """
 
+import uuid
 from datetime import UTC, datetime
 from unittest.mock import AsyncMock
 
 import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import hash_password
 from app.models.data_script import DataScript
-from app.models.task import ScheduledTask, ScheduleType, TaskStatus, TriggeredBy
+from app.models.task import ScheduledTask, ScheduleType, TaskExecution, TaskStatus, TriggeredBy
 from app.models.user import User, UserRole
 from app.services.execution_service import ExecutionService
 
-_counter = 0
+pytestmark = [pytest.mark.asyncio(loop_scope="module"), pytest.mark.usefixtures("frozen_now")]
 
+# Start/end time passed to update_execution; the service clock itself is frozen
+_FIXED_TIME = datetime(2024, 1, 1, 12, 0, tzinfo=UTC)
 
-async def _user(db):
-    global _counter
-    _counter += 1
+
+async def _user(db, hashed_password):
+    suffix = uuid.uuid4().hex[:8]
     u = User(
-        username=f"eu{_counter}",
-        email=f"eu{_counter}@t.com",
-        hashed_password=hash_password("P!1"),
+        username=f"eu_{suffix}",
+        email=f"eu_{suffix}@t.com",
+        hashed_password=hashed_password,
         role=UserRole.ADMIN,
         is_active=True,
     )
     db.add(u)
     await db.commit()
-    await db.refresh(u)
     return u
 
 
 async def _script(db, sid="s1"):
-    from sqlalchemy import select
-
     result = await db.execute(select(DataScript).where(DataScript.script_id == sid))
     existing = result.scalar_one_or_none()
     if existing:
@@ -42,12 +44,11 @@ async def _script(db, sid="s1"):
     s = DataScript(script_id=sid, script_name=sid, category="stock", function_name=sid)
     db.add(s)
     await db.commit()
-    await db.refresh(s)
     return s
 
 
-async def _task(db, script_id="s1"):
-    user = await _user(db)
+async def _task(db, hashed_password, script_id="s1"):
+    user = await _user(db, hashed_password)
     await _script(db, script_id)
     t = ScheduledTask(
         name="test_task",
@@ -63,17 +64,57 @@ async def _task(db, script_id="s1"):
     )
     db.add(t)
     await db.commit()
-    await db.refresh(t)
     return t
 
 
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def seeded_task(test_db_module, password_hash):
+    """One user, script and task shared by every test in the module."""
+    async with AsyncSession(bind=test_db_module, expire_on_commit=False) as db:
+        # These tests never check the password, so the cached hash is enough
+        return await _task(db, password_hash("P!1"))
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def exec_corpus(test_db_module, seeded_task):
+    """A few executions with distinct status, script and start time."""
+    executions = [
+        TaskExecution(
+            execution_id="corpus_pending",
+            task_id=seeded_task.id,
+            script_id="s1",
+            status=TaskStatus.PENDING,
+        ),
+        TaskExecution(
+            execution_id="corpus_2024",
+            task_id=seeded_task.id,
+            script_id="s1",
+            status=TaskStatus.COMPLETED,
+            start_time=datetime(2024, 6, 1, tzinfo=UTC),
+        ),
+        TaskExecution(
+            execution_id="corpus_2025",
+            task_id=seeded_task.id,
+            script_id="unique_script",
+            status=TaskStatus.FAILED,
+            start_time=datetime(2025, 6, 1, tzinfo=UTC),
+        ),
+    ]
+    async with AsyncSession(bind=test_db_module, expire_on_commit=False) as db:
+        db.add_all(executions)
+        await db.commit()
+    return executions
+
+
+@pytest.fixture
+def svc(shared_db):
+    return ExecutionService(shared_db)
+
+
 class TestCreateExecution:
-    @pytest.mark.asyncio
-    async def test_create(self, test_db):
-        svc = ExecutionService(test_db)
-        task = await _task(test_db)
+    async def test_create(self, svc, seeded_task):
         exec_rec = await svc.create_execution(
-            task_id=task.id,
+            task_id=seeded_task.id,
             script_id="s1",
             params={"key": "val"},
             triggered_by=TriggeredBy.MANUAL,
@@ -84,167 +125,107 @@ class TestCreateExecution:
 
 
 class TestUpdateExecution:
-    @pytest.mark.asyncio
-    async def test_update_status(self, test_db):
-        svc = ExecutionService(test_db)
-        task = await _task(test_db)
-        exec_rec = await svc.create_execution(task_id=task.id, script_id="s1")
-        now = datetime.now(UTC)
+    async def test_update_status(self, svc, seeded_task):
+        exec_rec = await svc.create_execution(task_id=seeded_task.id, script_id="s1")
         result = await svc.update_execution(
             exec_rec.execution_id,
             status=TaskStatus.RUNNING,
-            start_time=now,
+            start_time=_FIXED_TIME,
         )
         assert result is True
 
-    @pytest.mark.asyncio
-    async def test_update_complete(self, test_db):
-        svc = ExecutionService(test_db)
-        task = await _task(test_db)
-        exec_rec = await svc.create_execution(task_id=task.id, script_id="s1")
-        start = datetime.now(UTC)
+    async def test_update_complete(self, svc, seeded_task):
+        exec_rec = await svc.create_execution(task_id=seeded_task.id, script_id="s1")
         await svc.update_execution(
-            exec_rec.execution_id, status=TaskStatus.RUNNING, start_time=start
+            exec_rec.execution_id, status=TaskStatus.RUNNING, start_time=_FIXED_TIME
         )
-        end = datetime.now(UTC)
         result = await svc.update_execution(
             exec_rec.execution_id,
             status=TaskStatus.COMPLETED,
-            end_time=end,
+            end_time=_FIXED_TIME,
             result={"ok": True},
             rows_before=0,
             rows_after=100,
         )
         assert result is True
 
-    @pytest.mark.asyncio
-    async def test_update_failed(self, test_db):
-        svc = ExecutionService(test_db)
-        task = await _task(test_db)
-        exec_rec = await svc.create_execution(task_id=task.id, script_id="s1")
+    async def test_update_failed(self, svc, seeded_task):
+        exec_rec = await svc.create_execution(task_id=seeded_task.id, script_id="s1")
         result = await svc.update_execution(
             exec_rec.execution_id,
             status=TaskStatus.FAILED,
             error_message="boom",
             error_trace="traceback...",
-            end_time=datetime.now(UTC),
+            end_time=_FIXED_TIME,
         )
         assert result is True
 
-    @pytest.mark.asyncio
-    async def test_update_not_found(self, test_db):
-        svc = ExecutionService(test_db)
+    async def test_update_not_found(self, svc):
         result = await svc.update_execution("nonexistent_id", status=TaskStatus.RUNNING)
         assert result is False
 
 
 class TestGetExecutions:
-    @pytest.mark.asyncio
-    async def test_list_all(self, test_db):
-        svc = ExecutionService(test_db)
-        task = await _task(test_db)
-        await svc.create_execution(task_id=task.id, script_id="s1")
-        await svc.create_execution(task_id=task.id, script_id="s1")
+    async def test_list_all(self, svc, exec_corpus):
         execs, total = await svc.get_executions()
-        assert total >= 2
-
-    @pytest.mark.asyncio
-    async def test_filter_task_id(self, test_db):
-        svc = ExecutionService(test_db)
-        task = await _task(test_db)
-        await svc.create_execution(task_id=task.id, script_id="s1")
-        execs, total = await svc.get_executions(task_id=task.id)
-        assert total >= 1
-
-    @pytest.mark.asyncio
-    async def test_filter_script_id(self, test_db):
-        svc = ExecutionService(test_db)
-        task = await _task(test_db)
-        await svc.create_execution(task_id=task.id, script_id="unique_script")
+        assert total == len(exec_corpus)
+
+    async def test_filter_task_id(self, svc, seeded_task, exec_corpus):
+        execs, total = await svc.get_executions(task_id=seeded_task.id)
+        assert total == len(exec_corpus)
+
+    async def test_filter_script_id(self, svc, exec_corpus):
         execs, total = await svc.get_executions(script_id="unique_script")
-        assert total >= 1
+        assert total == 1
 
-    @pytest.mark.asyncio
-    async def test_filter_status(self, test_db):
-        svc = ExecutionService(test_db)
-        task = await _task(test_db)
-        await svc.create_execution(task_id=task.id, script_id="s1")
+    async def test_filter_status(self, svc, exec_corpus):
         execs, total = await svc.get_executions(status=TaskStatus.PENDING)
-        assert total >= 1
-
-    @pytest.mark.asyncio
-    async def test_filter_dates(self, test_db):
-        svc = ExecutionService(test_db)
-        task = await _task(test_db)
-        exec_rec = await svc.create_execution(task_id=task.id, script_id="s1")
-        now = datetime.now(UTC)
-        await svc.update_execution(exec_rec.execution_id, start_time=now)
+        assert total == 1
+
+    async def test_filter_dates(self, svc, exec_corpus):
         execs, total = await svc.get_executions(
-            start_date=datetime(2020, 1, 1, tzinfo=UTC),
-            end_date=datetime(2030, 1, 1, tzinfo=UTC),
+            start_date=datetime(2024, 1, 1, tzinfo=UTC),
+            end_date=datetime(2025, 1, 1, tzinfo=UTC),
         )
-        assert total >= 0
+        assert total == 1
 
 
 class TestGetStats:
-    @pytest.mark.asyncio
-    async def test_stats_empty(self, test_db):
-        svc = ExecutionService(test_db)
+    async def test_stats_empty(self, svc):
         stats = await svc.get_execution_stats()
         assert "total_count" in stats
         assert "success_rate" in stats
 
-    @pytest.mark.asyncio
-    async def test_stats_with_data(self, test_db):
-        svc = ExecutionService(test_db)
-        task = await _task(test_db)
-        exec_rec = await svc.create_execution(task_id=task.id, script_id="s1")
-        now = datetime.now(UTC)
+    async def test_stats_with_data(self, svc, seeded_task):
+        exec_rec = await svc.create_execution(task_id=seeded_task.id, script_id="s1")
         await svc.update_execution(
-            exec_rec.execution_id, status=TaskStatus.COMPLETED, start_time=now, end_time=now
+            exec_rec.execution_id,
+            status=TaskStatus.COMPLETED,
+            start_time=_FIXED_TIME,
+            end_time=_FIXED_TIME,
         )
         stats = await svc.get_execution_stats()
         assert stats["total_count"] >= 0
 
 
 class TestRecentRunningFailed:
-    @pytest.mark.asyncio
-    async def test_recent(self, test_db):
-        svc = ExecutionService(test_db)
-        result = await svc.get_recent_executions(limit=5)
-        assert isinstance(result, list)
-
-    @pytest.mark.asyncio
-    async def test_running(self, test_db):
-        svc = ExecutionService(test_db)
-        result = await svc.get_running_executions()
-        assert isinstance(result, list)
-
-    @pytest.mark.asyncio
-    async def test_failed(self, test_db):
-        svc = ExecutionService(test_db)
-        result = await svc.get_failed_executions()
-        assert isinstance(result, list)
+    async def test_recent_running_failed(self, svc):
+        assert isinstance(await svc.get_recent_executions(limit=5), list)
+        assert isinstance(await svc.get_running_executions(), list)
+        assert isinstance(await svc.get_failed_executions(), list)
 
 
 class TestDeleteExecutions:
-    @pytest.mark.asyncio
-    async def test_delete_by_ids(self, test_db):
-        svc = ExecutionService(test_db)
-        task = await _task(test_db)
-        exec_rec = await svc.create_execution(task_id=task.id, script_id="s1")
+    async def test_delete_by_ids(self, svc, seeded_task):
+        exec_rec = await svc.create_execution(task_id=seeded_task.id, script_id="s1")
         deleted = await svc.delete_executions_by_ids([exec_rec.execution_id])
         assert deleted >= 1
 
-    @pytest.mark.asyncio
-    async def test_delete_empty_ids(self, test_db):
-        svc = ExecutionService(test_db)
+    async def test_delete_empty_ids(self, svc):
         deleted = await svc.delete_executions_by_ids([])
         assert deleted == 0
 
-    @pytest.mark.asyncio
-    async def test_delete_by_status(self, test_db):
-        svc = ExecutionService(test_db)
+    async def test_delete_by_status(self, svc):
         deleted = await svc.delete_executions_by_status(TaskStatus.CANCELLED)
         assert deleted >= 0
 
@@ -256,20 +237,16 @@ class TestHandleExecutionComplete:
     handle_execution_complete now only logs and returns True.
     """
 
-    @pytest.mark.asyncio
-    async def test_non_failed(self, test_db):
-        svc = ExecutionService(test_db)
+    async def test_non_failed(self, svc):
         result = await svc.handle_execution_complete("some_id", TaskStatus.COMPLETED)
         assert result is True
 
-    @pytest.mark.asyncio
     async def test_failed_returns_true(self):
         mock_db = AsyncMock()
         svc = ExecutionService(mock_db)
         result = await svc.handle_execution_complete("nonexistent", TaskStatus.FAILED)
         assert result is True
 
-    @pytest.mark.asyncio
     async def test_cancelled_returns_true(self):
         mock_db = AsyncMock()
         svc = ExecutionService(mock_db)
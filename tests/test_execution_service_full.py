@@ -4,9 +4,6 @@ Comprehensive tests for ExecutionService.
 Covers create, update, get, list, stats, recent, running, failed, delete operations.
 """
 
-from datetime import UTC, datetime
-
-import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.task import ScheduledTask, ScheduleType, TaskStatus, TriggeredBy
@@ -24,15 +21,13 @@ async def _create_task(db: AsyncSession, user_id: int = 1) -> ScheduledTask:
         parameters={},
     )
     db.add(task)
-    await db.commit()
-    await db.refresh(task)
+    await db.flush()
     return task
 
 
 class TestExecutionServiceCreate:
     """Test execution creation."""
 
-    @pytest.mark.asyncio
     async def test_create_execution(self, test_db: AsyncSession):
         """Test creating an execution record."""
         task = await _create_task(test_db)
@@ -51,7 +46,6 @@ class TestExecutionServiceCreate:
         assert execution.status == TaskStatus.PENDING
         assert execution.task_id == task.id
 
-    @pytest.mark.asyncio
     async def test_create_execution_scheduler(self, test_db: AsyncSession):
         """Test creating an execution triggered by scheduler."""
         task = await _create_task(test_db)
@@ -70,8 +64,7 @@ class TestExecutionServiceCreate:
 class TestExecutionServiceUpdate:
     """Test execution update."""
 
-    @pytest.mark.asyncio
-    async def test_update_execution_status(self, test_db: AsyncSession):
+    async def test_update_execution_status(self, test_db: AsyncSession, frozen_now):
         """Test updating execution status."""
         task = await _create_task(test_db)
         service = ExecutionService(test_db)
@@ -84,12 +77,11 @@ class TestExecutionServiceUpdate:
         result = await service.update_execution(
             execution_id=execution.execution_id,
             status=TaskStatus.RUNNING,
-            start_time=datetime.now(UTC),
+            start_time=frozen_now,
         )
         assert result is True
 
-    @pytest.mark.asyncio
-    async def test_update_execution_complete(self, test_db: AsyncSession):
+    async def test_update_execution_complete(self, test_db: AsyncSession, frozen_now):
         """Test completing an execution."""
         task = await _create_task(test_db)
         service = ExecutionService(test_db)
@@ -102,15 +94,14 @@ class TestExecutionServiceUpdate:
         result = await service.update_execution(
             execution_id=execution.execution_id,
             status=TaskStatus.COMPLETED,
-            end_time=datetime.now(UTC),
+            end_time=frozen_now,
             result={"rows": 100},
             rows_before=0,
             rows_after=100,
         )
         assert result is True
 
-    @pytest.mark.asyncio
-    async def test_update_execution_failed(self, test_db: AsyncSession):
+    async def test_update_execution_failed(self, test_db: AsyncSession, frozen_now):
         """Test marking execution as failed."""
         task = await _create_task(test_db)
         service = ExecutionService(test_db)
@@ -123,13 +114,12 @@ class TestExecutionServiceUpdate:
         result = await service.update_execution(
             execution_id=execution.execution_id,
             status=TaskStatus.FAILED,
-            end_time=datetime.now(UTC),
+            end_time=frozen_now,
             error_message="Connection refused",
             error_trace="Traceback...",
         )
         assert result is True
 
-    @pytest.mark.asyncio
     async def test_update_nonexistent_execution(self, test_db: AsyncSession):
         """Test updating non-existent execution."""
         service = ExecutionService(test_db)
@@ -143,7 +133,6 @@ class TestExecutionServiceUpdate:
 class TestExecutionServiceGet:
     """Test get execution."""
 
-    @pytest.mark.asyncio
     async def test_get_by_execution_id(self, test_db: AsyncSession):
         """Test getting execution by ID."""
         task = await _create_task(test_db)
@@ -158,7 +147,6 @@ class TestExecutionServiceGet:
         assert found is not None
         assert found.execution_id == execution.execution_id
 
-    @pytest.mark.asyncio
     async def test_get_execution_alias(self, test_db: AsyncSession):
         """Test get_execution alias method."""
         task = await _create_task(test_db)
@@ -172,7 +160,6 @@ class TestExecutionServiceGet:
         found = await service.get_execution(execution.execution_id)
         assert found is not None
 
-    @pytest.mark.asyncio
     async def test_get_nonexistent(self, test_db: AsyncSession):
         """Test getting non-existent execution."""
         service = ExecutionService(test_db)
@@ -29,6 +29,9 @@ class TestGenerateTableName:
         result = generate_table_name("stock@#$hist")
         assert result == "ak_stockhist"
 
+    def test_name_mixed_separators_and_case(self):
+        assert generate_table_name("Fund.ETF-spot!") == "ak_Fund_ETF_spot"
+
     def test_name_starting_with_number(self):
         result = generate_table_name("123stock")
         assert result.startswith("ak_t_")
@@ -8,41 +8,36 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from app.services.interface_loader import InterfaceLoader
-
-
-@pytest.fixture
-def loader():
-    return InterfaceLoader()
+from app.models.interface import ParameterType
 
 
 class TestEnsureCategories:
     @pytest.mark.asyncio
-    async def test_creates_missing_categories(self, loader):
+    async def test_creates_missing_categories(self, interface_loader):
         mock_db = AsyncMock()
         mock_result = MagicMock()
         mock_result.scalar_one_or_none.return_value = None  # category doesn't exist
         mock_db.execute.return_value = mock_result
 
-        await loader._ensure_categories(mock_db)
+        await interface_loader._ensure_categories(mock_db)
         # Should add categories and commit
         assert mock_db.add.call_count >= 1
         mock_db.commit.assert_called()
 
     @pytest.mark.asyncio
-    async def test_skips_existing_categories(self, loader):
+    async def test_skips_existing_categories(self, interface_loader):
         mock_db = AsyncMock()
         mock_result = MagicMock()
         mock_result.scalar_one_or_none.return_value = MagicMock()  # exists
         mock_db.execute.return_value = mock_result
 
-        await loader._ensure_categories(mock_db)
+        await interface_loader._ensure_categories(mock_db)
         mock_db.add.assert_not_called()
 
 
 class TestLoadInterface:
     @pytest.mark.asyncio
-    async def test_already_exists(self, loader):
+    async def test_already_exists(self, interface_loader):
         mock_db = AsyncMock()
         mock_result = MagicMock()
         mock_result.scalar_one_or_none.return_value = MagicMock()  # already loaded
@@ -51,11 +46,11 @@ class TestLoadInterface:
         def sample_func(x: str, y: int = 5):
             """Sample function."""
 
-        await loader._load_interface("sample_func", sample_func, mock_db)
+        await interface_loader._load_interface("sample_func", sample_func, mock_db)
         mock_db.add.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_new_with_category(self, loader):
+    async def test_new_with_category(self, interface_loader):
         mock_db = AsyncMock()
         # First call: interface not found, second: category found
         results = [MagicMock(), MagicMock()]
@@ -68,11 +63,11 @@ class TestLoadInterface:
         def stock_data(symbol: str = "000001"):
             """Get stock data."""
 
-        await loader._load_interface("stock_data", stock_data, mock_db)
+        await interface_loader._load_interface("stock_data", stock_data, mock_db)
         mock_db.add.assert_called()
 
     @pytest.mark.asyncio
-    async def test_new_fallback_category(self, loader):
+    async def test_new_fallback_category(self, interface_loader):
         mock_db = AsyncMock()
         # interface not found, category not found, fallback category found
         results = [MagicMock(), MagicMock(), MagicMock()]
@@ -86,11 +81,11 @@ class TestLoadInterface:
         def custom_func():
             pass
 
-        await loader._load_interface("custom_func", custom_func, mock_db)
+        await interface_loader._load_interface("custom_func", custom_func, mock_db)
         mock_db.add.assert_called()
 
     @pytest.mark.asyncio
-    async def test_no_signature(self, loader):
+    async def test_no_signature(self, interface_loader):
         mock_db = AsyncMock()
         results = [MagicMock(), MagicMock()]
         results[0].scalar_one_or_none.return_value = None
@@ -105,84 +100,92 @@ class TestLoadInterface:
         func.__name__ = "test_func"
 
         with patch("app.services.interface_loader.inspect.signature", side_effect=ValueError):
-            await loader._load_interface("test_func", func, mock_db)
+            await interface_loader._load_interface("test_func", func, mock_db)
         mock_db.add.assert_called()
 
 
 class TestGetCategory:
-    def test_stock_prefix(self, loader):
-        assert loader._get_category("stock_zh_a_hist") == "stock"
-
-    def test_fund_prefix(self, loader):
-        assert loader._get_category("fund_etf_hist") == "fund"
-
-    def test_default(self, loader):
-        assert loader._get_category("random_function") == "stock"
+    @pytest.mark.parametrize(
+        ("name", "expected"),
+        [("stock_zh_a_hist", "stock"), ("fund_etf_hist", "fund"), ("random_function", "stock")],
+    )
+    def test_category(self, interface_loader, name, expected):
+        assert interface_loader._get_category(name) == expected
 
 
 class TestParseExample:
-    def test_no_docstring(self, loader):
-        assert loader._parse_example("") is None
-        assert loader._parse_example(None) is None
+    def test_no_docstring(self, interface_loader):
+        assert interface_loader._parse_example("") is None
+        assert interface_loader._parse_example(None) is None
 
-    def test_with_example(self, loader):
+    def test_with_example(self, interface_loader):
         doc = "Description\nExample\n  stock_data(symbol='000001')"
-        result = loader._parse_example(doc)
+        result = interface_loader._parse_example(doc)
         assert result is not None
 
-    def test_no_example(self, loader):
+    def test_no_example(self, interface_loader):
         doc = "Just a description"
-        assert loader._parse_example(doc) is None
+        assert interface_loader._parse_example(doc) is None
 
 
 class TestParseParameters:
-    def test_with_params(self, loader):
+    def test_with_params(self, interface_loader):
         def func(x: str, y: int = 5):
             pass
 
         sig = inspect.signature(func)
-        result = loader._parse_parameters(sig, "")
+        result = interface_loader._parse_parameters(sig, "")
         assert "x" in result
         assert result["x"]["required"] is True
         assert "y" in result
         assert result["y"]["required"] is False
 
-    def test_skips_self_kwargs(self, loader):
+    def test_skips_self_kwargs(self, interface_loader):
         def func(self, x: str, **kwargs):
             pass
 
         sig = inspect.signature(func)
-        result = loader._parse_parameters(sig, "")
+        result = interface_loader._parse_parameters(sig, "")
         assert "self" not in result
         assert "kwargs" not in result
         assert "x" in result
 
 
 class TestGetTypeName:
-    def test_types(self, loader):
-        assert loader._get_type_name(str) == "string"
-        assert loader._get_type_name(int) == "integer"
-        assert loader._get_type_name(float) == "float"
-        assert loader._get_type_name(bool) == "boolean"
-        assert loader._get_type_name(inspect.Parameter.empty) == "string"
-        assert loader._get_type_name(list) == "string"
+    @pytest.mark.parametrize(
+        ("annotation", "expected"),
+        [
+            (str, "string"),
+            (int, "integer"),
+            (float, "float"),
+            (bool, "boolean"),
+            (inspect.Parameter.empty, "string"),
+            (list, "string"),
+        ],
+    )
+    def test_types(self, interface_loader, annotation, expected):
+        assert interface_loader._get_type_name(annotation) == expected
 
 
 class TestMapParameterType:
-    def test_types(self, loader):
-        from app.models.interface import ParameterType
-
-        assert loader._map_parameter_type(str) == ParameterType.STRING
-        assert loader._map_parameter_type(int) == ParameterType.INTEGER
-        assert loader._map_parameter_type(float) == ParameterType.FLOAT
-        assert loader._map_parameter_type(bool) == ParameterType.BOOLEAN
-        assert loader._map_parameter_type(list) == ParameterType.STRING
-        assert loader._map_parameter_type(inspect.Parameter.empty) == ParameterType.STRING
+    @pytest.mark.parametrize(
+        ("annotation", "expected"),
+        [
+            (str, ParameterType.STRING),
+            (int, ParameterType.INTEGER),
+            (float, ParameterType.FLOAT),
+            (bool, ParameterType.BOOLEAN),
+            (list, ParameterType.STRING),
+            (inspect.Parameter.empty, ParameterType.STRING),
+        ],
+    )
+    def test_types(self, interface_loader, annotation, expected):
+        assert interface_loader._map_parameter_type(annotation) == expected
 
 
 class TestLoadFromAkshare:
     @pytest.mark.asyncio
-    async def test_load_success(self, loader):
+    async def test_load_success(self, interface_loader):
         mock_session = AsyncMock()
         mock_result = MagicMock()
         mock_result.scalar_one_or_none.return_value = None
@@ -193,17 +196,19 @@ class TestLoadFromAkshare:
             mock_sm.return_value.__aexit__ = AsyncMock(return_value=False)
 
             with (
-                patch.object(loader, "_ensure_categories", new_callable=AsyncMock),
+                patch.object(interface_loader, "_ensure_categories", new_callable=AsyncMock),
                 patch.object(
-                    loader, "_discover_akshare_functions", return_value=[("func1", lambda: None)]
+                    interface_loader,
+                    "_discover_akshare_functions",
+                    return_value=[("func1", lambda: None)],
                 ),
-                patch.object(loader, "_load_interface", new_callable=AsyncMock),
+                patch.object(interface_loader, "_load_interface", new_callable=AsyncMock),
             ):
-                count = await loader.load_from_akshare()
+                count = await interface_loader.load_from_akshare()
             assert count == 1
 
     @pytest.mark.asyncio
-    async def test_load_with_error(self, loader):
+    async def test_load_with_error(self, interface_loader):
         mock_session = AsyncMock()
 
         with patch("app.services.interface_loader.async_session_maker") as mock_sm:
@@ -211,16 +216,18 @@ class TestLoadFromAkshare:
             mock_sm.return_value.__aexit__ = AsyncMock(return_value=False)
 
             with (
-                patch.object(loader, "_ensure_categories", new_callable=AsyncMock),
+                patch.object(interface_loader, "_ensure_categories", new_callable=AsyncMock),
                 patch.object(
-                    loader, "_discover_akshare_functions", return_value=[("func1", lambda: None)]
+                    interface_loader,
+                    "_discover_akshare_functions",
+                    return_value=[("func1", lambda: None)],
                 ),
                 patch.object(
-                    loader,
+                    interface_loader,
                     "_load_interface",
                     new_callable=AsyncMock,
                     side_effect=RuntimeError("fail"),
                 ),
             ):
-                count = await loader.load_from_akshare()
+                count = await interface_loader.load_from_akshare()
             assert count == 0
@@ -41,27 +41,19 @@ class TestInterfaceLoaderCategories:
         # Should have at least some categories
         assert len(categories) > 0
 
-    def test_get_category_method(self):
+    def test_get_category_method(self, interface_loader):
         """Test _get_category method."""
-        from app.services.interface_loader import InterfaceLoader
-
-        loader = InterfaceLoader()
-
         # Test getting category from function name
-        category = loader._get_category("stock_zh_a_hist")
+        category = interface_loader._get_category("stock_zh_a_hist")
 
         # Should return a category
         assert category is not None
         assert isinstance(category, str)
 
-    def test_get_category_unknown_function(self):
+    def test_get_category_unknown_function(self, interface_loader):
         """Test _get_category with unknown function."""
-        from app.services.interface_loader import InterfaceLoader
-
-        loader = InterfaceLoader()
-
         # Unknown function should still return a category
-        category = loader._get_category("unknown_function_xyz")
+        category = interface_loader._get_category("unknown_function_xyz")
 
         assert category is not None
 
@@ -69,14 +61,10 @@ class TestInterfaceLoaderCategories:
 class TestInterfaceLoaderDisplayName:
     """Test display name generation."""
 
-    def test_generate_display_name(self):
+    def test_generate_display_name(self, interface_loader):
         """Test generating display names."""
-        from app.services.interface_loader import InterfaceLoader
-
-        loader = InterfaceLoader()
-
         # Test underscore to space conversion
-        display_name = loader._generate_display_name("stock_zh_a_hist")
+        display_name = interface_loader._generate_display_name("stock_zh_a_hist")
 
         assert display_name is not None
         assert " " in display_name or display_name == display_name
@@ -85,53 +73,37 @@ class TestInterfaceLoaderDisplayName:
 class TestInterfaceLoaderParameterParsing:
     """Test parameter parsing."""
 
-    def test_get_type_name(self):
+    def test_get_type_name(self, interface_loader):
         """Test _get_type_name method."""
-        from app.services.interface_loader import InterfaceLoader
-
-        loader = InterfaceLoader()
-
         # Test with basic types
-        str_type = loader._get_type_name(str)
+        str_type = interface_loader._get_type_name(str)
         assert str_type is not None
 
-        int_type = loader._get_type_name(int)
+        int_type = interface_loader._get_type_name(int)
         assert int_type is not None
 
-    def test_map_parameter_type(self):
+    def test_map_parameter_type(self, interface_loader):
         """Test _map_parameter_type method."""
-        from app.services.interface_loader import InterfaceLoader
-
-        loader = InterfaceLoader()
-
         # Test type mapping
-        param_type = loader._map_parameter_type(str)
+        param_type = interface_loader._map_parameter_type(str)
         assert param_type is not None
 
-        int_type = loader._map_parameter_type(int)
+        int_type = interface_loader._map_parameter_type(int)
         assert int_type is not None
 
 
 class TestInterfaceLoaderDocParsing:
     """Test docstring parsing."""
 
-    def test_parse_description_empty(self):
+    def test_parse_description_empty(self, interface_loader):
         """Test parsing empty description."""
-        from app.services.interface_loader import InterfaceLoader
-
-        loader = InterfaceLoader()
-
-        description = loader._parse_description("")
+        description = interface_loader._parse_description("")
 
         assert description == ""
 
-    def test_parse_example_with_no_example(self):
+    def test_parse_example_with_no_example(self, interface_loader):
         """Test parsing docstring without example."""
-        from app.services.interface_loader import InterfaceLoader
-
-        loader = InterfaceLoader()
-
-        example = loader._parse_example("This is a docstring without example")
+        example = interface_loader._parse_example("This is a docstring without example")
 
         # Should return None
         assert example is None
@@ -141,29 +113,21 @@ class TestInterfaceLoaderLoadFromAkshare:
     """Test loading from akshare."""
 
     @pytest.mark.asyncio
-    async def test_load_from_akshare_method_exists(self):
+    async def test_load_from_akshare_method_exists(self, interface_loader):
         """Test load_from_akshare method exists and is async."""
         import inspect
 
-        from app.services.interface_loader import InterfaceLoader
-
-        loader = InterfaceLoader()
-
         # Verify method exists and is async
-        assert hasattr(loader, "load_from_akshare")
-        assert inspect.iscoroutinefunction(loader.load_from_akshare)
+        assert hasattr(interface_loader, "load_from_akshare")
+        assert inspect.iscoroutinefunction(interface_loader.load_from_akshare)
 
 
 class TestInterfaceLoaderDiscoverFunctions:
     """Test function discovery."""
 
-    def test_discover_akshare_functions(self):
+    def test_discover_akshare_functions(self, interface_loader):
         """Test discovering akshare functions."""
-        from app.services.interface_loader import InterfaceLoader
-
-        loader = InterfaceLoader()
-
-        functions = loader._discover_akshare_functions()
+        functions = interface_loader._discover_akshare_functions()
 
         # Should return a list
         assert isinstance(functions, list)
@@ -5,209 +5,158 @@ Direct tests for interfaces API endpoints to maximize coverage.
 import pytest
 from fastapi import HTTPException
 
-from app.core.security import hash_password
+from app.api.interfaces import (
+    create_interface,
+    delete_interface,
+    get_interface,
+    list_categories,
+    list_interfaces,
+    update_interface,
+)
+from app.api.schemas import PaginatedParams
 from app.models.interface import DataInterface, InterfaceCategory
-from app.models.user import User, UserRole
-
-
-async def _user(db, role=UserRole.USER):
-    u = User(
-        username=f"iu_{role.value}",
-        email=f"iu_{role.value}@t.com",
-        hashed_password=hash_password("P!1"),
-        role=role,
-        is_active=True,
-    )
-    db.add(u)
-    await db.commit()
-    await db.refresh(u)
-    return u
+
+pytestmark = pytest.mark.asyncio(loop_scope="module")
 
 
-async def _cat(db, name="cat1"):
-    c = InterfaceCategory(name=name, description=f"Desc {name}", sort_order=1)
-    db.add(c)
+async def _cats(db, *names):
+    cats = [InterfaceCategory(name=n, description=f"Desc {n}", sort_order=1) for n in names]
+    db.add_all(cats)
     await db.commit()
-    await db.refresh(c)
-    return c
+    return cats
 
 
-async def _iface(db, name="iface1", cat_id=None, active=True):
+async def _ifaces(db, *names, cat_id=None, active=True):
     if cat_id is None:
-        cat = await _cat(db, f"cat_for_{name}")
+        cat = InterfaceCategory(name=f"cat_for_{names[0]}", description="Desc", sort_order=1)
+        db.add(cat)
+        await db.flush()
         cat_id = cat.id
-    i = DataInterface(
-        name=name, display_name=f"D {name}", category_id=cat_id, parameters={}, is_active=active
-    )
-    db.add(i)
+    ifaces = [
+        DataInterface(
+            name=n, display_name=f"D {n}", category_id=cat_id, parameters={}, is_active=active
+        )
+        for n in names
+    ]
+    db.add_all(ifaces)
     await db.commit()
-    await db.refresh(i)
-    return i
+    return ifaces
 
 
 class TestGetCategoriesDirect:
-    @pytest.mark.asyncio
-    async def test_get_categories(self, test_db):
-        from app.api.interfaces import list_categories
-
-        await _cat(test_db, "stock")
-        await _cat(test_db, "fund")
-        result = await list_categories(db=test_db)
+    async def test_get_categories(self, shared_db):
+        await _cats(shared_db, "stock", "fund")
+        result = await list_categories(db=shared_db)
         assert result.success is True
         assert len(result.data) >= 2
 
 
 class TestGetInterfacesDirect:
-    @pytest.mark.asyncio
-    async def test_list_all(self, test_db):
-        from app.api.interfaces import list_interfaces
-        from app.api.schemas import PaginatedParams
-
-        await _iface(test_db, "li1")
-        await _iface(test_db, "li2")
+    async def test_list_all(self, shared_db):
+        await _ifaces(shared_db, "li1", "li2")
         params = PaginatedParams(page=1, page_size=20)
         result = await list_interfaces(
-            db=test_db, params=params, category_id=None, search=None, is_active=None
+            db=shared_db, params=params, category_id=None, search=None, is_active=None
         )
         assert result.data["total"] >= 2
 
-    @pytest.mark.asyncio
-    async def test_filter_category(self, test_db):
-        from app.api.interfaces import list_interfaces
-        from app.api.schemas import PaginatedParams
-
-        cat = await _cat(test_db, "filter_cat")
-        await _iface(test_db, "fc1", cat.id)
+    async def test_filter_category(self, shared_db):
+        (cat,) = await _cats(shared_db, "filter_cat")
+        await _ifaces(shared_db, "fc1", cat_id=cat.id)
         params = PaginatedParams(page=1, page_size=20)
         result = await list_interfaces(
-            db=test_db, params=params, category_id=cat.id, search=None, is_active=None
+            db=shared_db, params=params, category_id=cat.id, search=None, is_active=None
         )
         assert result.data["total"] >= 1
 
-    @pytest.mark.asyncio
-    async def test_filter_active(self, test_db):
-        from app.api.interfaces import list_interfaces
-        from app.api.schemas import PaginatedParams
-
-        await _iface(test_db, "fa1", active=False)
+    async def test_filter_active(self, shared_db):
+        await _ifaces(shared_db, "fa1", active=False)
         params = PaginatedParams(page=1, page_size=20)
         result = await list_interfaces(
-            db=test_db, params=params, category_id=None, search=None, is_active=False
+            db=shared_db, params=params, category_id=None, search=None, is_active=False
         )
         assert result.success is True
 
-    @pytest.mark.asyncio
-    async def test_filter_keyword(self, test_db):
-        from app.api.interfaces import list_interfaces
-        from app.api.schemas import PaginatedParams
-
-        await _iface(test_db, "keyword_test_unique")
+    async def test_filter_keyword(self, shared_db):
+        await _ifaces(shared_db, "keyword_test_unique")
         params = PaginatedParams(page=1, page_size=20)
         result = await list_interfaces(
-            db=test_db, params=params, category_id=None, search="keyword_test", is_active=None
+            db=shared_db, params=params, category_id=None, search="keyword_test", is_active=None
         )
         assert result.success is True
 
 
 class TestGetInterfaceDirect:
-    @pytest.mark.asyncio
-    async def test_get_by_id(self, test_db):
-        from app.api.interfaces import get_interface
-
-        iface = await _iface(test_db, "gi1")
-        result = await get_interface(interface_id=iface.id, db=test_db)
+    async def test_get_by_id(self, shared_db):
+        (iface,) = await _ifaces(shared_db, "gi1")
+        result = await get_interface(interface_id=iface.id, db=shared_db)
         assert result.data["name"] == "gi1"
 
-    @pytest.mark.asyncio
-    async def test_not_found(self, test_db):
-        from app.api.interfaces import get_interface
-
+    async def test_not_found(self, shared_db):
         with pytest.raises(HTTPException) as exc:
-            await get_interface(interface_id=99999, db=test_db)
+            await get_interface(interface_id=99999, db=shared_db)
         assert exc.value.status_code == 404
 
 
 class TestCreateInterfaceDirect:
-    @pytest.mark.asyncio
-    async def test_create(self, test_db):
-        from app.api.interfaces import create_interface
-
-        admin = await _user(test_db, UserRole.ADMIN)
-        cat = await _cat(test_db, "create_cat")
+    async def test_create(self, shared_db, shared_admin):
+        (cat,) = await _cats(shared_db, "create_cat")
         result = await create_interface(
-            current_admin=admin,
+            current_admin=shared_admin,
             name="new_iface",
             display_name="New",
             category_id=cat.id,
-            db=test_db,
+            db=shared_db,
         )
         assert result.success is True
 
-    @pytest.mark.asyncio
-    async def test_create_invalid_category(self, test_db):
-        from app.api.interfaces import create_interface
-
-        admin = await _user(test_db, UserRole.ADMIN)
+    async def test_create_invalid_category(self, shared_db, shared_admin):
         with pytest.raises(HTTPException) as exc:
             await create_interface(
-                current_admin=admin,
+                current_admin=shared_admin,
                 name="bad_cat",
                 display_name="X",
                 category_id=99999,
-                db=test_db,
+                db=shared_db,
             )
         assert exc.value.status_code == 400
 
 
 class TestUpdateInterfaceDirect:
-    @pytest.mark.asyncio
-    async def test_update(self, test_db):
-        from app.api.interfaces import update_interface
-
-        admin = await _user(test_db, UserRole.ADMIN)
-        iface = await _iface(test_db, "upd_iface")
+    async def test_update(self, shared_db, shared_admin):
+        (iface,) = await _ifaces(shared_db, "upd_iface")
         result = await update_interface(
-            current_admin=admin,
+            current_admin=shared_admin,
             interface_id=iface.id,
             display_name="Updated",
             description="updated desc",
             is_active=False,
-            db=test_db,
+            db=shared_db,
         )
         assert result.success is True
 
-    @pytest.mark.asyncio
-    async def test_update_not_found(self, test_db):
-        from app.api.interfaces import update_interface
-
-        admin = await _user(test_db, UserRole.ADMIN)
+    async def test_update_not_found(self, shared_db, shared_admin):
         with pytest.raises(HTTPException) as exc:
             await update_interface(
-                current_admin=admin,
+                current_admin=shared_admin,
                 interface_id=99999,
                 display_name="X",
                 description=None,
                 is_active=None,
-                db=test_db,
+                db=shared_db,
             )
         assert exc.value.status_code == 404
 
 
 class TestDeleteInterfaceDirect:
-    @pytest.mark.asyncio
-    async def test_delete(self, test_db):
-        from app.api.interfaces import delete_interface
-
-        admin = await _user(test_db, UserRole.ADMIN)
-        iface = await _iface(test_db, "del_iface")
-        result = await delete_interface(interface_id=iface.id, current_admin=admin, db=test_db)
+    async def test_delete(self, shared_db, shared_admin):
+        (iface,) = await _ifaces(shared_db, "del_iface")
+        result = await delete_interface(
+            interface_id=iface.id, current_admin=shared_admin, db=shared_db
+        )
         assert result.success is True
 
-    @pytest.mark.asyncio
-    async def test_delete_not_found(self, test_db):
-        from app.api.interfaces import delete_interface
-
-        admin = await _user(test_db, UserRole.ADMIN)
+    async def test_delete_not_found(self, shared_db, shared_admin):
         with pytest.raises(HTTPException) as exc:
-            await delete_interface(interface_id=99999, current_admin=admin, db=test_db)
+            await delete_interface(interface_id=99999, current_admin=shared_admin, db=shared_db)
         assert exc.value.status_code == 404
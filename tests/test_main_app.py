@@ -28,27 +28,21 @@ class TestHealthCheck:
 class TestAppStartup:
     """Test app configuration."""
 
-    def test_app_exists(self):
+    def test_app_exists(self, main_app):
         """Test app object exists."""
-        from app.main import app
+        assert main_app is not None
+        assert main_app.title is not None
 
-        assert app is not None
-        assert app.title is not None
-
-    def test_cors_configured(self):
+    def test_cors_configured(self, main_app):
         """Test CORS middleware is configured."""
-        from app.main import app
-
         # Check that CORSMiddleware is in the middleware stack
-        middleware_classes = [type(m).__name__ for m in app.user_middleware]
+        middleware_classes = [type(m).__name__ for m in main_app.user_middleware]
         # The middleware is added via app.add_middleware, check routes exist
-        assert len(app.routes) > 0
+        assert len(main_app.routes) > 0
 
-    def test_routes_registered(self):
+    def test_routes_registered(self, main_app):
         """Test that API routes are registered."""
-        from app.main import app
-
-        route_paths = [route.path for route in app.routes if hasattr(route, "path")]
+        route_paths = [route.path for route in main_app.routes if hasattr(route, "path")]
         assert "/api/health" in route_paths or any("/api" in p for p in route_paths)
 
 
@@ -108,15 +102,13 @@ class TestRateLimit:
 
         assert get_limiter() is None
 
-    def test_rate_limit_decorator_passthrough(self):
+    @pytest.mark.asyncio
+    async def test_rate_limit_decorator_passthrough(self):
         """Test rate_limit decorator passes through in test mode."""
-        import asyncio
-
         from app.api.rate_limit import rate_limit
 
         @rate_limit("5/minute")
         async def test_func():
             return "ok"
 
-        result = asyncio.get_event_loop().run_until_complete(test_func())
-        assert result == "ok"
+        assert await test_func() == "ok"
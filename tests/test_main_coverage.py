@@ -2,63 +2,60 @@
 Tests for main.py covering lifespan, static files, and uncovered branches.
 """
 
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 
+@pytest.fixture
+def lifespan_mocks(monkeypatch):
+    """Stub out everything lifespan() touches; tests set ``settings.secret_key``."""
+    mocks = SimpleNamespace(
+        create_tables=AsyncMock(),
+        init_db=AsyncMock(),
+        scheduler=MagicMock(start=AsyncMock(), shutdown=AsyncMock()),
+        close_db=AsyncMock(),
+        settings=MagicMock(
+            app_name="test",
+            app_version="1.0",
+            app_env="test",
+            is_production=False,
+            workers=1,  # Avoid MagicMock > int in lifespan
+        ),
+    )
+    monkeypatch.setattr("app.core.database.create_tables", mocks.create_tables)
+    monkeypatch.setattr("app.main.init_db", mocks.init_db)
+    monkeypatch.setattr("app.main.task_scheduler", mocks.scheduler)
+    monkeypatch.setattr("app.main.close_db", mocks.close_db)
+    monkeypatch.setattr("app.main.settings", mocks.settings)
+    return mocks
+
+
 class TestLifespan:
     @pytest.mark.asyncio
-    async def test_lifespan_startup_shutdown(self):
+    async def test_lifespan_startup_shutdown(self, lifespan_mocks):
         from app.main import lifespan
 
-        with (
-            patch("app.core.database.create_tables", new_callable=AsyncMock) as mock_ct,
-            patch("app.main.init_db", new_callable=AsyncMock) as mock_init,
-            patch("app.main.task_scheduler") as mock_sched,
-            patch("app.main.close_db", new_callable=AsyncMock) as mock_close,
-            patch("app.main.settings") as mock_settings,
-        ):
-            mock_settings.app_name = "test"
-            mock_settings.app_version = "1.0"
-            mock_settings.app_env = "test"
-            mock_settings.secret_key = "your-secret-key-change-this-in-production"
-            mock_settings.is_production = False
-            mock_settings.workers = 1  # Avoid MagicMock > int in lifespan
-            mock_sched.start = AsyncMock()
-            mock_sched.shutdown = AsyncMock()
-
-            async with lifespan(MagicMock()):
-                pass
-
-            mock_ct.assert_called_once()
-            mock_init.assert_called_once()
-            mock_sched.start.assert_called_once()
-            mock_sched.shutdown.assert_called_once()
-            mock_close.assert_called_once()
+        lifespan_mocks.settings.secret_key = "your-secret-key-change-this-in-production"
+
+        async with lifespan(MagicMock()):
+            pass
+
+        lifespan_mocks.create_tables.assert_called_once()
+        lifespan_mocks.init_db.assert_called_once()
+        lifespan_mocks.scheduler.start.assert_called_once()
+        lifespan_mocks.scheduler.shutdown.assert_called_once()
+        lifespan_mocks.close_db.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_lifespan_safe_secret(self):
+    async def test_lifespan_safe_secret(self, lifespan_mocks):
         from app.main import lifespan
 
-        with (
-            patch("app.core.database.create_tables", new_callable=AsyncMock),
-            patch("app.main.init_db", new_callable=AsyncMock),
-            patch("app.main.task_scheduler") as mock_sched,
-            patch("app.main.close_db", new_callable=AsyncMock),
-            patch("app.main.settings") as mock_settings,
-        ):
-            mock_settings.app_name = "test"
-            mock_settings.app_version = "1.0"
-            mock_settings.app_env = "test"
-            mock_settings.secret_key = "a-real-secret-key-here"
-            mock_settings.is_production = False
-            mock_settings.workers = 1  # Avoid MagicMock > int in lifespan
-            mock_sched.start = AsyncMock()
-            mock_sched.shutdown = AsyncMock()
+        lifespan_mocks.settings.secret_key = "a-real-secret-key-here"
 
-            async with lifespan(MagicMock()):
-                pass
+        async with lifespan(MagicMock()):
+            pass
 
 
 class TestHealthCheckBranches:
@@ -107,12 +104,10 @@ class TestHealthCheckBranches:
 
 class TestRootEndpoint:
     @pytest.mark.asyncio
-    async def test_root_no_frontend(self):
+    async def test_root_no_frontend(self, main_app):
         """Test root endpoint when frontend dist doesn't exist."""
         with patch("app.main.FRONTEND_DIR") as mock_dir:
             mock_dir.is_dir.return_value = False
             # The root function is already defined at import time
             # Just test the existing root function if frontend not present
-            from app.main import app
-
-            assert app is not None
+            assert main_app is not None
@@ -2,6 +2,9 @@
 Direct tests for tables API endpoints to maximize coverage.
 """
 
+from unittest.mock import AsyncMock
+
+import pandas as pd
 import pytest
 from fastapi import HTTPException
 from sqlalchemy import text
@@ -225,6 +228,26 @@ class TestDeleteTableDirect:
         result = await delete_table(table_id=tbl.id, db=test_db, data_db=test_db, current_user=user)
         assert result.success is True
 
+    @pytest.mark.asyncio
+    async def test_delete_then_download_recreates_table(self, test_db):
+        from app.api.tables import delete_table
+        from app.services.data_acquisition import get_data_acquisition_service
+
+        svc = get_data_acquisition_service()
+        df = pd.DataFrame({"price": [1.5, 2.5]})
+        ddl_db = AsyncMock()
+        await svc._create_table_if_not_exists("redl_tbl", df, ddl_db)
+
+        user = await _user(test_db)
+        await test_db.execute(text("CREATE TABLE IF NOT EXISTS redl_tbl (id INTEGER)"))
+        await test_db.commit()
+        tbl = await _table(test_db, "redl_tbl")
+        await delete_table(table_id=tbl.id, db=test_db, data_db=test_db, current_user=user)
+
+        # Downloading into the dropped table runs CREATE TABLE again
+        await svc._create_table_if_not_exists("redl_tbl", df, ddl_db)
+        assert ddl_db.execute.call_count == 2
+
 
 class TestExportTableDataDirect:
     @pytest.mark.asyncio